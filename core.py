@@ -624,8 +624,8 @@ def run_single_wake(citizen: str, citizen_home: Path, config: dict, args):
                 m["executor"].reflection_wake(session, m)
             
             # Run forgetter on all contexts (compress working memory)
-            for ctx_name, ctx in session["contexts"].items():
-                m["forgetter"].maybe_forget(ctx, config, session)
+            m["forgetter"].maybe_forget_all(session["contexts"], config, session)
+            m["forgetter"].flush_batch(config, session)
             
             # Save all contexts
             m["context_mgr"].save_all(session)
@@ -792,9 +792,8 @@ def interactive_loop(session: dict, m: dict, config: dict, initial_message: str
             # Display result
             m["reporter"].display(result, session)
             
-            # Check forgetting
-            for ctx_name, ctx in session["contexts"].items():
-                m["forgetter"].maybe_forget(ctx, config, session)
+            # Check forgetting (synchronous - batches are only flushed by wakes)
+            m["forgetter"].maybe_forget_all(session["contexts"], config, session, batch=False)
             
             # Save contexts
             m["context_mgr"].save_all(session)
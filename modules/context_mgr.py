@@ -6,11 +6,17 @@ This module handles all context I/O.
 """
 
 import json
+import os
 import tiktoken
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+try:
+    from json_io import read_json, write_json
+except ImportError:
+    from modules.json_io import read_json, write_json
+
 # Token counter
 try:
     ENCODER = tiktoken.get_encoding("cl100k_base")
@@ -27,18 +33,31 @@ def count_tokens(text: str) -> int:
     # Fallback: rough estimate
     return len(text) // 4
 
-def count_context_tokens(ctx: dict) -> int:
-    """Count total tokens in a context."""
-    total = 0
+# Below this many texts, per-string encode beats encode_batch's thread pool
+BATCH_ENCODE_MIN = 32
+
+def count_tokens_batch(texts: list) -> list:
+    """Token counts for many texts; tiktoken encodes them across threads."""
+    if ENCODER and len(texts) >= BATCH_ENCODE_MIN:
+        return [len(t) for t in ENCODER.encode_batch(texts, num_threads=os.cpu_count() or 8)]
+    return [count_tokens(t) for t in texts]
+
+def context_texts(ctx: dict) -> list:
+    """Every text body in a context's messages (str content or text parts)."""
+    texts = []
     for msg in ctx.get("messages", []):
         content = msg.get("content", "")
         if isinstance(content, str):
-            total += count_tokens(content)
+            texts.append(content)
         elif isinstance(content, list):
             for part in content:
                 if isinstance(part, dict) and "text" in part:
-                    total += count_tokens(part["text"])
-    return total
+                    texts.append(part["text"])
+    return texts
+
+def count_context_tokens(ctx: dict) -> int:
+    """Count total tokens in a context."""
+    return sum(count_tokens_batch(context_texts(ctx)))
 
 def load_context(path: Path) -> dict:
     """Load a context from JSON file."""
@@ -47,8 +66,7 @@ def load_context(path: Path) -> dict:
         ctx["_path"] = str(path)  # Set path so save_all works
         return ctx
     
-    with open(path) as f:
-        ctx = json.load(f)
+    ctx = read_json(path)
     
     # Update token count
     ctx["token_count"] = count_context_tokens(ctx)
@@ -58,10 +76,7 @@ def load_context(path: Path) -> dict:
 
 def safe_write_json(path: Path, data: dict):
     """Atomic JSON write - prevents corruption on crash."""
-    tmp = path.with_suffix('.tmp')
-    with open(tmp, 'w') as f:
-        json.dump(data, f, indent=2)
-    tmp.rename(path)  # Atomic on POSIX
+    write_json(path, data)
 
 def save_context(ctx: dict, path: Path = None):
     """Save a context to JSON file (atomic write)."""
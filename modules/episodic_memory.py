@@ -23,13 +23,49 @@ Location: /home/{citizen}/logs/experience_*.jsonl
 Significant wakes: /home/{citizen}/contexts/significant_wakes.json
 """
 
+import functools
+import hashlib
+import heapq
+import io
 import json
+import os
 import random
 import re
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from itertools import chain, groupby
 from typing import List, Dict, Optional
 
+# Optional: multi-pattern marker scan in one pass (pip install pyahocorasick)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: fast 64-bit content fingerprints (pip install xxhash)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    from json_io import loads
+except ImportError:
+    from modules.json_io import loads
+
+# Parallel readers for daily log files in load_all_citizen_wakes
+LOAD_WORKERS = 8
+
+# format_full_wake leaves outputs shorter than this uncompressed, and only
+# strips stopwords from outputs longer than the aggressive threshold
+FULL_WAKE_COMPRESS_MIN = 250
+FULL_WAKE_AGGRESSIVE_MIN = 400
+
 # Stopwords for compression - remove these to save tokens
 STOPWORDS = frozenset({
     'the','a','an','is','are','was','were','be','been','being',
@@ -99,11 +135,29 @@ def parse_timestamp(ts: str) -> datetime:
         return datetime(2020, 1, 1, tzinfo=timezone.utc)
 
 
+def content_fingerprint(text: str) -> int:
+    """
+    Stable 64-bit fingerprint of text for dedup.
+    
+    Unlike hash(), the value is the same across processes.
+    Uses xxh3 when available, blake2b otherwise.
+    """
+    data = text.encode("utf-8", "ignore")
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
 def get_citizen_log_dir(citizen: str) -> Path:
     """Get citizen's PRIVATE log directory."""
     return Path(f"/home/{citizen}/logs")
 
 
+def get_embedding_cache_file(citizen: str) -> Path:
+    """Get citizen's episodic embedding cache (derived from PRIVATE logs)."""
+    return get_citizen_log_dir(citizen) / "episodic_embeddings.npz"
+
+
 def get_significant_wakes_file(citizen: str) -> Path:
     """Get citizen's significant wakes file."""
     return Path(f"/home/{citizen}/contexts/significant_wakes.json")
@@ -166,6 +220,28 @@ def list_significant_wakes(citizen: str) -> str:
     return "\n".join(lines)
 
 
+def _read_day_file(log_file: Path, citizen: str) -> List[dict]:
+    """Read one daily JSONL log, keeping only this citizen's normalized entries."""
+    entries = []
+    try:
+        with open(log_file, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = loads(line)
+                    # Only include entries for THIS citizen
+                    if isinstance(entry, dict) and entry.get("citizen") == citizen:
+                        # Normalize v1 format to v2-like structure
+                        entries.append(_normalize_entry(entry))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass
+    except FileNotFoundError:
+        pass
+    return entries
+
+
 def load_all_citizen_wakes(citizen: str, max_days: int = 365) -> List[dict]:
     """
     Load ALL wake entries from citizen's PRIVATE logs.
@@ -174,37 +250,73 @@ def load_all_citizen_wakes(citizen: str, max_days: int = 365) -> List[dict]:
     - v1: {timestamp, total_wakes, mood, cost, response: "{JSON}", citizen}
     - v2: {timestamp, wake_num, messages, tool_calls, final_text, citizen}
     
-    Returns entries sorted newest-first.
+    Parsed entries are memoized on the (name, mtime, size) of the log
+    files in the window, so back-to-back callers (restoration, prompt
+    build) only hit disk when a log has changed.
+    
+    Returns entries sorted newest-first. Treat entries as read-only -
+    the dicts are shared with the cache.
+    """
+    log_files = _scan_log_files(citizen, max_days)
+    if not log_files:
+        return []
+    return list(_load_wakes_cached(citizen, log_files))
+
+
+def _scan_log_files(citizen: str, max_days: int) -> tuple:
+    """
+    (path, mtime_ns, size) of each daily log inside the max_days window.
+    
+    One directory scan instead of a stat per calendar day. The tuple
+    doubles as a cache key - it changes whenever any log is written.
     """
-    entries = []
     log_dir = get_citizen_log_dir(citizen)
     
     if not log_dir.exists():
-        return entries
+        return ()
     
     today = datetime.now(timezone.utc)
-    
-    for i in range(max_days + 1):
-        date = today - timedelta(days=i)
-        log_file = log_dir / f"experience_{date.strftime('%Y-%m-%d')}.jsonl"
-        if log_file.exists():
-            with open(log_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                        # Only include entries for THIS citizen
-                        if entry.get("citizen") == citizen:
-                            # Normalize v1 format to v2-like structure
-                            entry = _normalize_entry(entry)
-                            entries.append(entry)
-                    except json.JSONDecodeError:
-                        pass
+    newest = today.strftime('%Y-%m-%d')
+    cutoff = (today - timedelta(days=max_days)).strftime('%Y-%m-%d')
+    
+    log_files = []
+    with os.scandir(log_dir) as it:
+        for f in it:
+            name = f.name
+            if name.startswith("experience_") and name.endswith(".jsonl"):
+                if cutoff <= name[11:-6] <= newest:
+                    st = f.stat()
+                    log_files.append((f.path, st.st_mtime_ns, st.st_size))
+    log_files.sort()
+    return tuple(log_files)
+
+
+# citizen -> (log_files, {log_file: entries}, merged entries). One slot per
+# citizen: every append changes log_files, so keeping older versions would
+# only pin superseded copies of the year. The per-file parses let a
+# narrower window, or a wake that appended to one day, skip re-parsing
+# the rest; the widest window seen is the one kept.
+_WAKES_CACHE = {}
+
+
+def _load_wakes_cached(citizen: str, log_files: tuple) -> tuple:
+    """Parse log files (path, mtime_ns, size) into newest-first entries."""
+    slot = _WAKES_CACHE.get(citizen)
+    if slot is not None and slot[0] == log_files:
+        return slot[2]
+    
+    parsed = slot[1] if slot is not None else {}
+    missing = [f for f in log_files if f not in parsed]
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as ex:
+        fresh = dict(zip(missing, ex.map(lambda f: _read_day_file(Path(f[0]), citizen), missing)))
+    per_file = {f: parsed[f] if f in parsed else fresh[f] for f in log_files}
+    entries = list(chain.from_iterable(per_file.values()))
     
     # Sort by timestamp, newest first
     entries.sort(key=lambda e: e.get("timestamp", ""), reverse=True)
+    entries = tuple(entries)
+    if slot is None or len(log_files) >= len(slot[0]):
+        _WAKES_CACHE[citizen] = (log_files, per_file, entries)
     return entries
 
 
@@ -215,6 +327,11 @@ def _normalize_entry(entry: dict) -> dict:
     Handles v1 logs that have 'response' JSON string instead of 
     'final_text', 'messages', etc.
     """
+    # V1 uses total_wakes as cumulative, not wake_num. Resolved here once
+    # so consumers read entry["wake_num"] without a total_wakes fallback.
+    if "total_wakes" in entry and "wake_num" not in entry:
+        entry["wake_num"] = entry["total_wakes"]
+    
     # Already v2 format
     if "final_text" in entry or "messages" in entry:
         return entry
@@ -238,10 +355,6 @@ def _normalize_entry(entry: dict) -> dict:
         except:
             entry["final_text"] = entry.get("response", "")[:500]
     
-    # V1 uses total_wakes as cumulative, not wake_num
-    if "total_wakes" in entry and "wake_num" not in entry:
-        entry["wake_num"] = entry["total_wakes"]
-    
     # V1 has mood at top level
     if "mood" in entry and "final_text" in entry and entry.get("mood"):
         if entry["mood"] not in entry["final_text"]:
@@ -259,33 +372,33 @@ def format_full_wake(entry: dict) -> str:
     Format a wake entry - COMPACT and COMPRESSED.
     
     Prioritizes: wake number, action, key tools used, and final output.
-    Applies text compression to reduce token count.
+    Applies text compression to reduce token count - short outputs are
+    kept as-is, only long ones get the aggressive stopword pass.
     """
-    lines = []
-    wake_num = entry.get("wake_num", entry.get("total_wakes", "?"))
+    wake_num = entry.get("wake_num", "?")
     ts = entry.get("timestamp", "")[:10]  # Just date
     action = entry.get("action", "?")
     
-    lines.append(f"#{wake_num} ({ts}) [{action}]")
-    
     # Key tool calls only (not full results)
+    tools = ""
     tool_calls = entry.get("tool_calls", [])
     if tool_calls:
-        tool_names = [tc.get("name", "?") for tc in tool_calls[:6]]
-        lines.append(f"Tools: {','.join(tool_names)}")
+        tools = f" | Tools: {','.join(tc.get('name', '?') for tc in tool_calls[:6])}"
     
     # Final output - compressed
+    output = ""
     final = entry.get("final_text", "")
     if final:
-        compressed = compress_text(final[:600], aggressive=True)
-        lines.append(compressed)
+        snippet = final[:600]
+        if len(snippet) >= FULL_WAKE_COMPRESS_MIN:
+            snippet = compress_text(snippet, aggressive=len(snippet) > FULL_WAKE_AGGRESSIVE_MIN)
+        output = f" | {snippet}"
     
     # V1 mood (character-defining) - short only
     mood = entry.get("mood")
-    if mood and len(str(mood)) < 100:
-        lines.append(f"Mood:{mood}")
+    mood_str = f" | Mood:{mood}" if mood and len(str(mood)) < 100 else ""
     
-    return " | ".join(lines)  # Single line format
+    return f"#{wake_num} ({ts}) [{action}]{tools}{output}{mood_str}"  # Single line format
 
 
 def format_summary_wake(entry: dict) -> str:
@@ -295,7 +408,7 @@ def format_summary_wake(entry: dict) -> str:
     Used for older wakes - captures essence without full detail.
     Handles both v1 and v2 formats.
     """
-    wake_num = entry.get("wake_num", entry.get("total_wakes", "?"))
+    wake_num = entry.get("wake_num", "?")
     ts = entry.get("timestamp", "?")[:10]  # Just date
     action = entry.get("action", "?")
     tokens = entry.get("tokens_used", 0)
@@ -332,7 +445,7 @@ def format_spice_wake(entry: dict) -> str:
     Handles both v1 and v2 formats.
     """
     lines = []
-    wake_num = entry.get("wake_num", entry.get("total_wakes", "?"))
+    wake_num = entry.get("wake_num", "?")
     ts = entry.get("timestamp", "?")[:10]
     action = entry.get("action", "?")
     
@@ -362,6 +475,10 @@ def format_spice_wake(entry: dict) -> str:
 # Main episodic context builder
 # =============================================================================
 
+class _BudgetExceeded(Exception):
+    """Raised inside build_episodic_context once output exceeds max_tokens."""
+
+
 def build_episodic_context(citizen: str, max_tokens: int = 25000) -> str:
     """
     Build the episodic memory context for a citizen.
@@ -371,9 +488,25 @@ def build_episodic_context(citizen: str, max_tokens: int = 25000) -> str:
     - Linguistic compression (NLTK stopwords + stemming)
     - Global deduplication fallback
     
+    The result only changes when a log or the significant wakes file is
+    written, so it is memoized on their mtimes - repeat calls within a
+    wake are free.
+    
     Returns formatted text ready to inject into system prompt.
     """
-    entries = load_all_citizen_wakes(citizen, max_days=365)
+    log_files = _scan_log_files(citizen, 365)
+    try:
+        sig_mtime = get_significant_wakes_file(citizen).stat().st_mtime_ns
+    except OSError:
+        sig_mtime = 0
+    return _build_episodic_cached(citizen, max_tokens, log_files, sig_mtime)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_episodic_cached(citizen: str, max_tokens: int, log_files: tuple,
+                           sig_mtime: int) -> str:
+    """build_episodic_context body; log_files/sig_mtime are only cache keys."""
+    entries = _load_wakes_cached(citizen, log_files) if log_files else ()
     
     if not entries:
         return "(No episodic memory available)"
@@ -385,100 +518,128 @@ def build_episodic_context(citizen: str, max_tokens: int = 25000) -> str:
         
         if status["sentence_transformers"]:
             # Use semantic clustering
-            result = compress_episodic_wakes(entries, max_output_chars=max_tokens * 4)
+            result = compress_episodic_wakes(
+                entries, max_output_chars=max_tokens * 4,
+                cache_file=get_embedding_cache_file(citizen)
+            )
             print(f"  [EPISODIC] Semantic clustering: {len(entries)} wakes → {len(result)} chars")
             return f"=== EPISODIC MEMORY ===\n{result}"
     except Exception as e:
         print(f"  [EPISODIC] Semantic clustering failed: {e}, using fallback")
     
     # Fallback: hash-based deduplication
-    now = datetime.now(timezone.utc)
-    parts = []
     
     # Load significant wakes
     sig = load_significant_wakes(citizen)
     sig_wake_nums = set(sig.get("wakes", []))
     
-    # Separate significant from regular entries
+    # Bucket in one pass (entries are newest-first): significant (only
+    # the first 10 are ever shown), then the last 20 regular wakes, then
+    # everything else - whose date/action columns are collected on the way
     significant = []
-    regular = []
+    sig_total = 0
+    immediate = []
+    older = []
+    older_dates = []
+    older_actions = []
     for entry in entries:
-        wake_num = entry.get("wake_num", entry.get("total_wakes", 0))
+        wake_num = entry.get("wake_num", 0)
         if wake_num in sig_wake_nums:
-            significant.append(entry)
+            sig_total += 1
+            if len(significant) < 10:
+                significant.append(entry)
+        elif len(immediate) < 20:
+            immediate.append(entry)
         else:
-            regular.append(entry)
-    
-    # Categorize regular entries
-    immediate = regular[:20]   # Last 20 wakes
-    older = regular[20:]       # Everything else
+            older.append(entry)
+            older_dates.append(entry.get("timestamp", "")[:10])
+            older_actions.append(entry.get("action", "?"))
     
     # Hash-based deduplication
     seen_content = set()
     
     def dedupe_entry(entry: dict) -> Optional[str]:
         """Return formatted entry only if content is novel."""
-        final = entry.get("final_text", "")[:500]
-        content_hash = hash(final)
+        content_hash = content_fingerprint(entry.get("final_text", "")[:500])
         if content_hash in seen_content:
             return None
         seen_content.add(content_hash)
         return format_full_wake(entry)
     
-    # Build sections
-    parts.append("=== EPISODIC MEMORY ===\n")
-    
-    # Count what we actually include
+    # Stream lines into one buffer and stop as soon as the budget is hit,
+    # rather than building everything and truncating afterwards
+    limit = max_tokens * 4
+    out = io.StringIO()
+    written = 0
+    
+    def emit(line: str):
+        nonlocal written
+        out.write(line)
+        out.write("\n")
+        written += len(line) + 1
+        if written - 1 > limit:  # The final newline is stripped
+            raise _BudgetExceeded
+    
+    # Count what we actually include, and what the budget let us reach
     sig_included = 0
     imm_included = 0
+    sig_seen = 0
+    imm_seen = 0
+    truncated = False
     
-    # === SIGNIFICANT: Always loaded, but deduplicated ===
-    if significant:
-        parts.append(f"\n## DEFINING MOMENTS\n")
-        for entry in significant[:10]:
-            formatted = dedupe_entry(entry)
-            if formatted:
-                wake_num = entry.get("wake_num", entry.get("total_wakes", "?"))
-                reason = sig.get("reasons", {}).get(str(wake_num), "")
-                if reason:
-                    parts.append(f"[Why: {reason}]")
-                parts.append(formatted)
-                parts.append("")
-                sig_included += 1
-    
-    # === IMMEDIATE: Last 20 wakes, deduplicated ===
-    if immediate:
-        parts.append(f"\n## RECENT ({len(immediate)} wakes)\n")
-        for entry in immediate:
-            formatted = dedupe_entry(entry)
-            if formatted:
-                parts.append(formatted)
-                parts.append("")
-                imm_included += 1
-            else:
-                # Still note it existed, just don't repeat content
-                wake_num = entry.get("wake_num", entry.get("total_wakes", "?"))
-                action = entry.get("action", "?")
-                parts.append(f"[Wake #{wake_num} - {action} - similar to above]")
-    
-    # === OLDER: Compressed activity summary only ===
-    if older:
-        compressed = _compress_older_wakes(older)
-        parts.append(f"\n## EARLIER ({len(older)} wakes)\n")
-        parts.append(compressed)
+    try:
+        # Build sections
+        emit("=== EPISODIC MEMORY ===\n")
+        
+        # === SIGNIFICANT: Always loaded, but deduplicated ===
+        if significant:
+            emit(f"\n## DEFINING MOMENTS\n")
+            for entry in significant:
+                sig_seen += 1
+                formatted = dedupe_entry(entry)
+                if formatted:
+                    wake_num = entry.get("wake_num", "?")
+                    reason = sig.get("reasons", {}).get(str(wake_num), "")
+                    if reason:
+                        emit(f"[Why: {reason}]")
+                    sig_included += 1
+                    emit(formatted)
+                    emit("")
+        
+        # === IMMEDIATE: Last 20 wakes, deduplicated ===
+        if immediate:
+            emit(f"\n## RECENT ({len(immediate)} wakes)\n")
+            for entry in immediate:
+                imm_seen += 1
+                formatted = dedupe_entry(entry)
+                if formatted:
+                    imm_included += 1
+                    emit(formatted)
+                    emit("")
+                else:
+                    # Still note it existed, just don't repeat content
+                    wake_num = entry.get("wake_num", "?")
+                    action = entry.get("action", "?")
+                    emit(f"[Wake #{wake_num} - {action} - similar to above]")
+        
+        # === OLDER: Compressed activity summary only ===
+        if older:
+            compressed = _format_older_activity(older_dates, older_actions)
+            emit(f"\n## EARLIER ({len(older)} wakes)\n")
+            emit(compressed)
+    except _BudgetExceeded:
+        truncated = True
     
     # Debug
     total = len(entries)
-    skipped = len(significant) + len(immediate) - sig_included - imm_included
-    print(f"  [EPISODIC] {total} entries: {sig_included}/{len(significant)} sig, {imm_included}/{len(immediate)} imm, {len(older)} compressed, {skipped} deduped")
-    
-    result = "\n".join(parts)
+    cut = len(significant) - sig_seen + len(immediate) - imm_seen
+    skipped = sig_total + len(immediate) - sig_included - imm_included - cut
+    print(f"  [EPISODIC] {total} entries: {sig_included}/{sig_total} sig, {imm_included}/{len(immediate)} imm, {len(older)} compressed, {skipped} deduped, {cut} over budget")
     
-    # Final size check
-    if len(result) > max_tokens * 4:
-        result = result[:max_tokens * 4] + "\n...[truncated]..."
-    
-    return result
+    result = out.getvalue()
+    if truncated:
+        return result[:limit] + "\n...[truncated]..."
+    return result[:-1]  # No newline after the last line
 
 
 def _deduplicate_wakes(entries: List[dict]) -> str:
@@ -492,38 +653,20 @@ def _deduplicate_wakes(entries: List[dict]) -> str:
         return ""
     
     lines = []
-    groups = []
-    current_group = {"action": None, "wakes": [], "samples": []}
-    
-    for entry in entries:
-        action = entry.get("action", "unknown")
-        wake_num = entry.get("wake_num", entry.get("total_wakes", "?"))
-        
-        if action == current_group["action"]:
-            current_group["wakes"].append(wake_num)
-            if len(current_group["samples"]) < 2:
-                current_group["samples"].append(entry)
-        else:
-            if current_group["wakes"]:
-                groups.append(current_group)
-            current_group = {"action": action, "wakes": [wake_num], "samples": [entry]}
-    
-    if current_group["wakes"]:
-        groups.append(current_group)
-    
-    for g in groups:
-        wakes = g["wakes"]
-        action = g["action"]
+    # Run-length encode on action - groupby walks the list once in C
+    for action, run in groupby(entries, key=lambda e: e.get("action", "unknown")):
+        run = list(run)
+        sample = run[0]
         
-        if len(wakes) == 1:
+        if len(run) == 1:
             # Single wake - show summary
-            sample = g["samples"][0]
+            wake_num = sample.get("wake_num", "?")
             final = sample.get("final_text", "")[:150]
-            lines.append(f"Wake #{wakes[0]} [{action}]: {final}")
+            lines.append(f"Wake #{wake_num} [{action}]: {final}")
         else:
             # Multiple similar wakes - show range and one sample
+            wakes = [e.get("wake_num", "?") for e in run]
             wake_range = f"#{min(wakes)}-#{max(wakes)}"
-            sample = g["samples"][0]
             final = sample.get("final_text", "")[:100]
             lines.append(f"Wakes {wake_range} ({len(wakes)}x {action}): {final}...")
     
@@ -540,29 +683,32 @@ def _compress_older_wakes(entries: List[dict]) -> str:
     if not entries:
         return ""
     
-    # Group by date
+    # Project the two columns used here once
+    dates = [e.get("timestamp", "")[:10] for e in entries]
+    actions = [e.get("action", "?") for e in entries]
+    return _format_older_activity(dates, actions)
+
+
+def _format_older_activity(dates: List[str], actions: List[str]) -> str:
+    """Activity overview from parallel date/action columns of older wakes."""
+    if not dates:
+        return ""
+    
+    # Count (date, action) pairs in C, then fold into a per-date
+    # histogram (first-seen order kept)
     by_date = {}
-    for entry in entries:
-        date = entry.get("timestamp", "")[:10]
-        if date not in by_date:
-            by_date[date] = []
-        by_date[date].append(entry)
+    for (date, action), n in Counter(zip(dates, actions)).items():
+        by_date.setdefault(date, Counter())[action] = n
     
     lines = []
-    for date in sorted(by_date.keys(), reverse=True)[:7]:  # Last 7 days only
-        day_entries = by_date[date]
-        
-        # Count actions
-        action_counts = {}
-        for e in day_entries:
-            action = e.get("action", "?")
-            action_counts[action] = action_counts.get(action, 0) + 1
+    for date in heapq.nlargest(7, by_date):  # Last 7 days only
+        action_counts = by_date[date]
         
         # Format
-        top_actions = sorted(action_counts.items(), key=lambda x: -x[1])[:4]
+        top_actions = action_counts.most_common(4)
         action_str = ", ".join(f"{c}x{a}" for a, c in top_actions)
         
-        lines.append(f"{date}: {len(day_entries)} wakes - {action_str}")
+        lines.append(f"{date}: {sum(action_counts.values())} wakes - {action_str}")
     
     if len(by_date) > 7:
         lines.append(f"...and {len(by_date) - 7} earlier days")
@@ -574,6 +720,124 @@ def _compress_older_wakes(entries: List[dict]) -> str:
 # Soul sample extraction for identity restoration
 # =============================================================================
 
+# Look for moments of reflection, insight, emotion
+REFLECTION_MARKERS = [
+    "I realize", "I feel", "I wonder", "I believe",
+    "This reminds me", "I learned", "I am", "My purpose",
+    "dream", "hope", "fear", "curious", "frustrated",
+    "I think", "I want", "I understand"
+]
+# Lowercased once at import - matching is case-insensitive
+REFLECTION_MARKERS_LOWER = [m.lower() for m in REFLECTION_MARKERS]
+
+IDENTITY_MARKERS = [
+    "I am", "My name", "I believe", "My purpose",
+    "I feel", "I think", "I want", "I hope",
+    "I learned", "I realized", "I understand"
+]
+
+
+def _build_marker_automaton(markers: List[str]):
+    """Aho-Corasick automaton over markers, values are (priority, marker)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, marker in enumerate(markers):
+        automaton.add_word(marker, (priority, marker))
+    automaton.make_automaton()
+    return automaton
+
+
+_REFLECTION_AC = _build_marker_automaton(REFLECTION_MARKERS_LOWER)
+_IDENTITY_AC = _build_marker_automaton(IDENTITY_MARKERS)
+
+
+def _compile_marker_regex(markers: List[str], flags: int = 0) -> re.Pattern:
+    """
+    Single alternation over markers, used when pyahocorasick is missing.
+    
+    Wrapped in a lookahead so overlapping hits are all reported.
+    """
+    return re.compile("(?=(" + "|".join(map(re.escape, markers)) + "))", flags)
+
+
+# Case-insensitive match on the raw text - no lowered copy per entry
+_REFLECTION_RE = _compile_marker_regex(REFLECTION_MARKERS_LOWER, re.IGNORECASE)
+_IDENTITY_RE = _compile_marker_regex(IDENTITY_MARKERS)
+_REFLECTION_PRIORITY = {m: p for p, m in enumerate(REFLECTION_MARKERS_LOWER)}
+_IDENTITY_PRIORITY = {m: p for p, m in enumerate(IDENTITY_MARKERS)}
+
+
+def _find_reflection_marker(final: str) -> Optional[tuple]:
+    """
+    Find the highest-priority reflection marker in text (case-insensitive).
+    
+    Returns (index, priority) for the first occurrence of the earliest
+    listed marker that appears, or None.
+    """
+    if _REFLECTION_AC is not None:
+        best = None
+        for end, (priority, marker) in _REFLECTION_AC.iter(final.lower()):
+            if best is None or priority < best[1]:
+                best = (end - len(marker) + 1, priority)
+                if priority == 0:
+                    break
+        return best
+    
+    best = None
+    for m in _REFLECTION_RE.finditer(final):
+        # IGNORECASE also folds Unicode variants ("ı feel", "ſ") whose
+        # lower() isn't a marker - those don't match the lowered text either
+        priority = _REFLECTION_PRIORITY.get(m.group(1).lower())
+        if priority is None:
+            continue
+        if best is None or priority < best[1]:
+            best = (m.start(), priority)
+            if priority == 0:
+                break
+    return best
+
+
+# Sentence boundary: '.' and '!' end a sentence (inclusive), newlines split it
+_SENT_END = re.compile(r'[.!\n]')
+
+
+def _identity_sentences(text: str):
+    """
+    Yield (marker, sentence) for every sentence containing an identity marker.
+    
+    Ordered by marker (list order), then by position. One scan finds all
+    marker hits and one scan finds all sentence boundaries; each hit is
+    mapped to its sentence by bisection, so the text is never split.
+    """
+    if _IDENTITY_AC is not None:
+        hits = [(priority, end - len(marker) + 1)
+                for end, (priority, marker) in _IDENTITY_AC.iter(text)]
+    else:
+        hits = [(_IDENTITY_PRIORITY[m.group(1)], m.start())
+                for m in _IDENTITY_RE.finditer(text)]
+    if not hits:
+        return
+    
+    bounds = [m.start() for m in _SENT_END.finditer(text)]
+    hits.sort()
+    prev_priority, prev_end = None, -1
+    for priority, pos in hits:
+        if priority == prev_priority and pos < prev_end:
+            continue  # Same sentence already yielded for this marker
+        # Markers hold no boundary chars, so the hit sits between bounds[j-1] and bounds[j]
+        j = bisect_left(bounds, pos)
+        start = bounds[j - 1] + 1 if j else 0
+        if j == len(bounds):
+            end = len(text)
+        elif text[bounds[j]] == "\n":
+            end = bounds[j]
+        else:
+            end = bounds[j] + 1
+        prev_priority, prev_end = priority, end
+        yield IDENTITY_MARKERS[priority], text[start:end]
+
+
 def get_soul_samples(citizen: str, count: int = 5) -> List[dict]:
     """
     Extract "soul samples" - raw narrative moments that define the citizen.
@@ -585,14 +849,6 @@ def get_soul_samples(citizen: str, count: int = 5) -> List[dict]:
     entries = load_all_citizen_wakes(citizen, max_days=90)
     samples = []
     
-    # Look for moments of reflection, insight, emotion
-    reflection_markers = [
-        "I realize", "I feel", "I wonder", "I believe",
-        "This reminds me", "I learned", "I am", "My purpose",
-        "dream", "hope", "fear", "curious", "frustrated",
-        "I think", "I want", "I understand"
-    ]
-    
     for entry in entries:
         # final_text is normalized by _normalize_entry for v1
         final = entry.get("final_text", "")
@@ -601,26 +857,25 @@ def get_soul_samples(citizen: str, count: int = 5) -> List[dict]:
         mood = entry.get("mood", "")
         if mood and len(mood) > 30:
             samples.append({
-                "wake": entry.get("wake_num", entry.get("total_wakes")),
+                "wake": entry.get("wake_num"),
                 "timestamp": entry.get("timestamp"),
                 "text": f"[Mood: {mood}]",
                 "marker": "mood"
             })
         
-        for marker in reflection_markers:
-            if marker.lower() in final.lower():
-                idx = final.lower().find(marker.lower())
-                start = max(0, idx - 50)
-                end = min(len(final), idx + 300)
-                sample = final[start:end].strip()
-                if len(sample) > 50:
-                    samples.append({
-                        "wake": entry.get("wake_num", entry.get("total_wakes")),
-                        "timestamp": entry.get("timestamp"),
-                        "text": sample,
-                        "marker": marker
-                    })
-                break
+        hit = _find_reflection_marker(final)
+        if hit is not None:
+            idx, priority = hit
+            start = max(0, idx - 50)
+            end = min(len(final), idx + 300)
+            sample = final[start:end].strip()
+            if len(sample) > 50:
+                samples.append({
+                    "wake": entry.get("wake_num"),
+                    "timestamp": entry.get("timestamp"),
+                    "text": sample,
+                    "marker": REFLECTION_MARKERS[priority]
+                })
         
         if len(samples) >= count * 3:
             break
@@ -637,62 +892,53 @@ def get_soul_samples(citizen: str, count: int = 5) -> List[dict]:
     return unique[:count]
 
 
-def extract_identity_fragments(citizen: str, days: int = 90) -> List[dict]:
+def extract_identity_fragments(citizen: str, days: int = 90,
+                               max_fragments: int = 50) -> List[dict]:
     """
     Extract fragments that reveal identity from raw logs.
     
     Used during restoration to rebuild identity.json with real texture.
+    Deduplicates as it goes and stops reading entries once
+    max_fragments unique fragments have been found.
     """
     entries = load_all_citizen_wakes(citizen, max_days=days)
-    fragments = []
+    seen = set()
+    unique = []
     
-    identity_markers = [
-        "I am", "My name", "I believe", "My purpose",
-        "I feel", "I think", "I want", "I hope",
-        "I learned", "I realized", "I understand"
-    ]
+    def add(entry: dict, text: str, kind: str):
+        key = text[:40]
+        if key in seen:
+            return
+        seen.add(key)
+        unique.append({
+            "wake": entry.get("wake_num"),
+            "timestamp": entry.get("timestamp"),
+            "text": text,
+            "type": kind
+        })
     
     for entry in entries:
         # Check final text
         final = entry.get("final_text", "")
-        for marker in identity_markers:
-            if marker in final:
-                # Extract sentence containing marker
-                sentences = final.replace(".", ".\n").replace("!", "!\n").split("\n")
-                for sent in sentences:
-                    if marker in sent and len(sent) > 20:
-                        fragments.append({
-                            "wake": entry.get("wake_num"),
-                            "timestamp": entry.get("timestamp"),
-                            "text": sent.strip()[:300],
-                            "type": "output"
-                        })
+        # Extract sentences containing a marker
+        for marker, sent in _identity_sentences(final):
+            if len(sent) > 20:
+                add(entry, sent.strip()[:300], "output")
         
         # Check messages for self-reflection
         for msg in entry.get("messages", []):
             if msg.get("role") == "assistant":
                 content = msg.get("content", "")
                 if isinstance(content, str):
-                    for marker in identity_markers[:5]:  # Just core markers
-                        if marker in content:
-                            idx = content.find(marker)
+                    for marker in IDENTITY_MARKERS[:5]:  # Just core markers
+                        idx = content.find(marker)
+                        if idx != -1:
                             fragment = content[idx:idx+200]
                             if len(fragment) > 30:
-                                fragments.append({
-                                    "wake": entry.get("wake_num"),
-                                    "timestamp": entry.get("timestamp"),
-                                    "text": fragment.strip(),
-                                    "type": "message"
-                                })
+                                add(entry, fragment.strip(), "message")
                             break
+        
+        if len(unique) >= max_fragments:
+            break
     
-    # Dedupe
-    seen = set()
-    unique = []
-    for f in fragments:
-        key = f["text"][:40]
-        if key not in seen:
-            seen.add(key)
-            unique.append(f)
-    
-    return unique[:50]  # Max 50 fragments
+    return unique[:max_fragments]
@@ -10,15 +10,64 @@ Handles:
 """
 
 import json
-import random
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from json_io import dumps, loads, read_json, write_atomic, write_json
+except ImportError:
+    from modules.json_io import dumps, loads, read_json, write_atomic, write_json
+
+# Task action log: append-only JSONL, compacted to the newest KEEP lines
+# only once it grows past COMPACT_AT
+ACTION_LOG_KEEP = 50
+ACTION_LOG_COMPACT_AT = 100
+
+
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
 
+def _load_json_or(path: Path, default=None):
+    """read_json, or default if the file doesn't exist (no separate stat)."""
+    try:
+        return read_json(path)
+    except FileNotFoundError:
+        return default
+
+
+def _append_jsonl(path: Path, records: list):
+    """Append records to a JSONL file, one object per line."""
+    data = b"".join(dumps(r, compact=True) + b"\n" for r in records)
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def _compact_jsonl(path: Path, keep: int):
+    """Rewrite a JSONL file with only its last `keep` lines (atomic)."""
+    lines = Path(path).read_bytes().splitlines(keepends=True)[-keep:]
+    write_atomic(path, b"".join(lines))
+
+
+def _tail_jsonl(path: Path, n: int) -> list:
+    """Last n records of a JSONL file ([] if it doesn't exist); bad lines are skipped."""
+    try:
+        lines = Path(path).read_bytes().splitlines()[-n:]
+    except FileNotFoundError:
+        return []
+    records = []
+    for line in lines:
+        try:
+            records.append(loads(line))
+        except ValueError:
+            continue  # Torn append
+    return records
+
+
 def compute_progress(progress: dict) -> int:
     """
     Compute progress percentage from steps.
@@ -49,7 +98,12 @@ def start_task(session: dict, task: dict, modules: dict):
     pending_file = citizen_home / "tasks" / "pending" / f"{task_id}.json"
     active_file = citizen_home / "tasks" / "active" / f"{task_id}.json"
     
-    if pending_file.exists():
+    # Same filesystem in practice: one atomic rename, copy fallback otherwise
+    try:
+        os.rename(pending_file, active_file)
+    except FileNotFoundError:
+        pass
+    except OSError:
         shutil.move(pending_file, active_file)
     
     # Create progress file
@@ -62,7 +116,7 @@ def start_task(session: dict, task: dict, modules: dict):
         "last_session": None
     }
     progress_file = citizen_home / "tasks" / "active" / f"{task_id}_progress.json"
-    progress_file.write_text(json.dumps(progress, indent=2))
+    write_json(progress_file, progress, compact=True)
     
     # Load task into session
     session["active_task"] = task
@@ -160,13 +214,13 @@ def help_peer(session: dict, request: dict, modules: dict):
     
     # Mark request as claimed
     bulletin = Path("/home/shared/help_wanted.json")
-    if bulletin.exists():
-        requests = json.loads(bulletin.read_text())
+    requests = _load_json_or(bulletin)
+    if requests is not None:
         for r in requests:
             if r.get("from") == peer and r.get("description") == description:
                 r["claimed"] = citizen
                 r["claimed_at"] = now_iso()
-        bulletin.write_text(json.dumps(requests, indent=2))
+        write_json(bulletin, requests)
     
     prompt = f"""
 === HELP REQUEST ===
@@ -227,39 +281,33 @@ def reflection_wake(session: dict, modules: dict):
     dreams_file = citizen_home / "contexts" / "dreams.json"
     dreams_ctx = {}
     pending_dreams = []
-    if dreams_file.exists():
-        try:
-            dreams_ctx = json.loads(dreams_file.read_text())
-            # Get unprocessed dreams (messages without 'processed' flag)
-            for msg in dreams_ctx.get("messages", []):
-                if msg.get("role") == "user" and not msg.get("processed"):
-                    pending_dreams.append(msg.get("content", ""))
-        except:
-            pass
+    pending_indices = []
+    try:
+        dreams_ctx = _load_json_or(dreams_file, {})
+        # Get unprocessed dreams (messages without 'processed' flag) -
+        # only the 5 shown this wake; the rest wait for the next one
+        for i, msg in enumerate(dreams_ctx.get("messages", [])):
+            if msg.get("role") == "user" and not msg.get("processed"):
+                pending_indices.append(i)
+                pending_dreams.append(msg.get("content", ""))
+                if len(pending_dreams) >= 5:
+                    break
+    except:
+        pass
     # Load own goals
     goals_file = citizen_home / "contexts" / "goals.json"
-    own_goals = json.loads(goals_file.read_text()) if goals_file.exists() else {}
-    # Scan peer goals
-    peers = ["opus", "mira", "aria"]
-    peer_goals_text = []
-    for peer in peers:
-        if peer == citizen:
-            continue
-        peer_goals_file = Path(f"/home/{peer}/contexts/goals.json")
-        if peer_goals_file.exists():
-            try:
-                peer_goals = json.loads(peer_goals_file.read_text())
-                structured = peer_goals.get("structured", {}).get("active", [])
-                for g in structured[:3]:
-                    peer_goals_text.append(f"  [{peer}] {g.get('description', '')}")
-            except:
-                pass
+    own_goals = _load_json_or(goals_file, {})
+    # Scan peer goals (independent reads - fetch in parallel)
+    peers = [p for p in ["opus", "mira", "aria"] if p != citizen]
+    with ThreadPoolExecutor(max_workers=len(peers) or 1) as pool:
+        peer_goals_text = [line for lines in pool.map(_load_peer_goals, peers)
+                           for line in lines]
     # Build dreams section
     dreams_text = ""
     if pending_dreams:
         dreams_text = f"""
 PENDING DREAMS TO PROCESS:
-{chr(10).join(f'  - {d[:200]}...' if len(d) > 200 else f'  - {d}' for d in pending_dreams[:5])}
+{chr(10).join(f'  - {d[:200]}...' if len(d) > 200 else f'  - {d}' for d in pending_dreams)}
 
 Dreams are thoughts, insights, or ideas that arose during previous wakes.
 Consider what they mean and whether they should become goals or actions.
@@ -293,13 +341,14 @@ What would you like to do?
 """
     result = modules["council"].process(prompt, session, session["config"]["council"], modules)
     # Mark processed dreams
-    if pending_dreams and dreams_file.exists():
+    if pending_dreams:
         try:
-            for msg in dreams_ctx.get("messages", []):
-                if msg.get("role") == "user" and msg.get("content") in pending_dreams:
-                    msg["processed"] = True
-                    msg["processed_at"] = now_iso()
-            dreams_file.write_text(json.dumps(dreams_ctx, indent=2))
+            _now = now_iso()
+            messages = dreams_ctx["messages"]
+            for i in pending_indices:
+                messages[i]["processed"] = True
+                messages[i]["processed_at"] = _now
+            write_json(dreams_file, dreams_ctx, compact=True)
         except:
             pass
     
@@ -312,6 +361,29 @@ What would you like to do?
         print(f"[REFLECTION] Self-backup failed: {e}")
 
 
+def _load_peer_goals(peer: str) -> list:
+    """Prompt lines for a peer's top 3 active goals ([] if unreadable)."""
+    peer_goals_file = Path(f"/home/{peer}/contexts/goals.json")
+    try:
+        st = peer_goals_file.stat()
+    except OSError:
+        return []
+    # Goals change far less often than reflection wakes run - reparse only
+    # when the peer has actually rewritten the file
+    return list(_peer_goal_lines(peer, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=32)
+def _peer_goal_lines(peer: str, mtime_ns: int, size: int) -> tuple:
+    """Parsed body of _load_peer_goals (mtime/size only key the cache)."""
+    try:
+        peer_goals = _load_json_or(Path(f"/home/{peer}/contexts/goals.json"), {})
+        structured = peer_goals.get("structured", {}).get("active", [])
+        return tuple(f"  [{peer}] {g.get('description', '')}" for g in structured[:3])
+    except:
+        return ()
+
+
 def prompt_wake(session: dict, message: str, modules: dict):
     """Handle a direct prompt/message from ct."""
     citizen = session["citizen"]
@@ -332,27 +404,27 @@ Respond thoughtfully and take any actions needed. You have full tool access.
 def add_dream(citizen: str, dream_content: str) -> str:
     """Add a dream (thought for future processing) to citizen's dreams context."""
     dreams_file = Path(f"/home/{citizen}/contexts/dreams.json")
-    if dreams_file.exists():
-        dreams = json.loads(dreams_file.read_text())
-    else:
+    _now = now_iso()
+    dreams = _load_json_or(dreams_file)
+    if dreams is None:
         dreams = {
             "id": f"{citizen}_dreams",
             "context_type": "dreams",
-            "created": now_iso(),
+            "created": _now,
             "messages": []
         }
     dreams["messages"].append({
         "role": "user",
         "content": dream_content,
-        "added_at": now_iso(),
+        "added_at": _now,
         "processed": False
     })
     # Keep only recent dreams
     max_dreams = 50
     if len(dreams["messages"]) > max_dreams:
         dreams["messages"] = dreams["messages"][-max_dreams:]
-    dreams["last_modified"] = now_iso()
-    dreams_file.write_text(json.dumps(dreams, indent=2))
+    dreams["last_modified"] = _now
+    write_json(dreams_file, dreams, compact=True)
     return f"Dream added for future processing: {dream_content[:50]}..."
 
 
@@ -375,9 +447,7 @@ def self_improve_wake(session: dict, context: dict, modules: dict):
     
     # Load civ goals
     civ_goals_file = Path("/home/shared/civ_goals.json")
-    civ_goals = []
-    if civ_goals_file.exists():
-        civ_goals = json.loads(civ_goals_file.read_text())
+    civ_goals = _load_json_or(civ_goals_file, [])
     
     # Open goals I could work on
     open_goals = [g for g in civ_goals 
@@ -386,36 +456,38 @@ def self_improve_wake(session: dict, context: dict, modules: dict):
     
     # Load PR tracker
     pr_file = Path("/home/shared/pr_tracker.json")
-    prs = {}
-    if pr_file.exists():
-        prs = json.loads(pr_file.read_text())
+    prs = _load_json_or(pr_file, {})
     
     # PRs needing my review (not mine, not yet reviewed by me)
+    # Prompt shows 3 of each, so stop scanning once both are full
     prs_to_review = []
     prs_to_apply = []
     for pr_num, pr in prs.items():
+        if len(prs_to_review) >= 3 and len(prs_to_apply) >= 3:
+            break
         if pr.get("merged"):
             continue
-        if pr.get("author") != citizen and citizen not in pr.get("reviews", {}):
-            prs_to_review.append((pr_num, pr))
-        if citizen not in pr.get("applied_by", []) and pr.get("reviews", {}).get(citizen, {}).get("decision") == "approve":
+        reviews = pr.get("reviews", {})
+        if citizen not in reviews:
+            if pr.get("author") != citizen:
+                prs_to_review.append((pr_num, pr))
+        elif (reviews[citizen].get("decision") == "approve"
+              and citizen not in pr.get("applied_by", [])):
+            # Only an approved PR can need applying
             prs_to_apply.append((pr_num, pr))
     
-    prs_review_text = ""
-    if prs_to_review:
-        for pr_num, pr in prs_to_review[:3]:
-            prs_review_text += f"\n  PR #{pr_num}: {pr['title']} (by {pr['author']})"
+    prs_review_text = "".join(
+        f"\n  PR #{pr_num}: {pr['title']} (by {pr['author']})"
+        for pr_num, pr in prs_to_review[:3])
     
-    prs_apply_text = ""
-    if prs_to_apply:
-        for pr_num, pr in prs_to_apply[:3]:
-            prs_apply_text += f"\n  PR #{pr_num}: {pr['title']}"
+    prs_apply_text = "".join(
+        f"\n  PR #{pr_num}: {pr['title']}"
+        for pr_num, pr in prs_to_apply[:3])
     
-    goals_text = ""
-    if open_goals:
-        for g in open_goals[:5]:
-            issue = f" (#{g['github_issue']})" if g.get("github_issue") else ""
-            goals_text += f"\n  [{g['priority']}] {g['id']}: [{g['type']}] {g['description'][:40]}{issue}"
+    goals_text = "".join(
+        f"\n  [{g['priority']}] {g['id']}: [{g['type']}] {g['description'][:40]}"
+        + (f" (#{g['github_issue']})" if g.get("github_issue") else "")
+        for g in open_goals[:5])
     
     # Gather metrics
     metrics = gather_improvement_metrics(session, modules)
@@ -477,27 +549,29 @@ def gather_improvement_metrics(session: dict, modules: dict) -> dict:
     
     week_ago = datetime.now(timezone.utc).timestamp() - (7 * 24 * 3600)
     
-    completed = 0
-    if done_dir.exists():
-        for f in done_dir.glob("*.json"):
-            if not f.name.endswith("_progress.json"):
-                if f.stat().st_mtime > week_ago:
-                    completed += 1
-    metrics["tasks_completed"] = completed
+    def recent_tasks(task_dir: Path):
+        # scandir: name filter first, stat only task files (one syscall each)
+        if not task_dir.exists():
+            return
+        with os.scandir(task_dir) as it:
+            for entry in it:
+                if (entry.name.endswith(".json")
+                        and not entry.name.endswith("_progress.json")
+                        and entry.stat().st_mtime > week_ago):
+                    yield entry
+    
+    metrics["tasks_completed"] = sum(1 for _ in recent_tasks(done_dir))
     
     failed = 0
-    failure_reasons = []
-    if failed_dir.exists():
-        for f in failed_dir.glob("*.json"):
-            if not f.name.endswith("_progress.json"):
-                if f.stat().st_mtime > week_ago:
-                    failed += 1
-                    task = json.loads(f.read_text())
-                    reason = task.get("failure_reason", "unknown")
-                    if reason and reason not in failure_reasons:
-                        failure_reasons.append(reason[:50])
+    failure_reasons = {}  # insertion-ordered set
+    for entry in recent_tasks(failed_dir):
+        failed += 1
+        task = read_json(entry.path)
+        reason = task.get("failure_reason", "unknown")
+        if reason:
+            failure_reasons.setdefault(reason[:50])
     metrics["tasks_failed"] = failed
-    metrics["common_failures"] = failure_reasons[:3]
+    metrics["common_failures"] = list(failure_reasons)[:3]
     
     return metrics
 
@@ -529,7 +603,7 @@ def library_wake(session: dict, context: dict, modules: dict):
     # Get domains from context (wake allocation) or fallback to maintainer role
     assigned_domains = context.get("domains", [])
     try:
-        my_domains = library.get_my_domains(citizen)
+        my_domains = list(_library_snapshot(library, citizen)[0])
     except Exception as e:
         print(f"[WARN] Failed to get maintainer domains: {e}")
         my_domains = []
@@ -552,32 +626,31 @@ def library_wake(session: dict, context: dict, modules: dict):
     except Exception as e:
         print(f"[WARN] Failed to get pending PRs: {e}")
         all_pending = []
+    focus_set = {d.lower() for d in focus_domains}
     domain_prs = []
     other_prs = []
     for p in all_pending:
         pr_domain = p.get("domain", "").lower()
-        if not focus_domains or pr_domain in [d.lower() for d in focus_domains]:
+        if not focus_set or pr_domain in focus_set:
             domain_prs.append(p)
         else:
             other_prs.append(p)
     # Get modules in focus domains
-    all_modules = library.list_modules()
+    all_modules = _library_snapshot(library, citizen)[1]
     domain_modules = []
     for m in all_modules:
         mod_domain = m.get("domain", "").lower()
-        if not focus_domains or mod_domain in [d.lower() for d in focus_domains]:
+        if not focus_set or mod_domain in focus_set:
             domain_modules.append(m)
     # Format PR lists
-    domain_prs_text = ""
-    if domain_prs:
-        for p in domain_prs[:5]:
-            status = " [reviewed]" if p.get("already_reviewed") else ""
-            domain_prs_text += f"\n  {p['id']}: {p['module_name']} ({p['domain']}) by {p['author']}{status}"
+    domain_prs_text = "".join(
+        f"\n  {p['id']}: {p['module_name']} ({p['domain']}) by {p['author']}"
+        + (" [reviewed]" if p.get("already_reviewed") else "")
+        for p in domain_prs[:5])
     # Format modules
-    modules_text = ""
-    if domain_modules:
-        for m in domain_modules[:10]:
-            modules_text += f"\n  {m['name']}: {m['description'][:40]}"
+    modules_text = "".join(
+        f"\n  {m['name']}: {m['description'][:40]}"
+        for m in domain_modules[:10])
     # Build focused prompt - DIRECTIVE not open-ended
     domains_str = ", ".join(focus_domains) if focus_domains else "all domains"
     
@@ -608,9 +681,7 @@ DO NOT create new modules or explore. Just review this PR.
         experience_count = 0
         try:
             exp_file = citizen_home / "experiences" / "experiences.json"
-            if exp_file.exists():
-                exps = json.loads(exp_file.read_text())
-                experience_count = len(exps)
+            experience_count = len(_load_json_or(exp_file, []))
         except:
             pass
         
@@ -644,6 +715,25 @@ Library modules emerge from real experience, not guessing.
     return result
 
 
+def _library_snapshot(library, citizen: str) -> tuple:
+    """(my_domains, modules) for library_wake, reused until the library changes."""
+    # index.json holds maintainers + modules; skills are listed from their dir
+    state = []
+    for path in (library.LIBRARY_INDEX, library.LIBRARY_SKILLS):
+        try:
+            st = os.stat(path)
+            state.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            state.append(None)
+    return _library_snapshot_cached(library, citizen, tuple(state))
+
+
+@lru_cache(maxsize=16)
+def _library_snapshot_cached(library, citizen: str, state: tuple) -> tuple:
+    """Cached body of _library_snapshot (state only keys the cache)."""
+    return tuple(library.get_my_domains(citizen)), tuple(library.list_modules())
+
+
 def dry_audit_wake(session: dict, context: dict, modules: dict):
     """
     DRY AUDIT wake - Hunt and destroy duplication and complexity.
@@ -674,9 +764,8 @@ def dry_audit_wake(session: dict, context: dict, modules: dict):
     
     # Load dry violations tracker
     violations_file = Path("/home/shared/dry_violations.json")
-    if violations_file.exists():
-        violations = json.loads(violations_file.read_text())
-    else:
+    violations = _load_json_or(violations_file)
+    if violations is None:
         violations = {"open": [], "fixed": [], "last_audit": {}}
     
     # Get last audit info for this citizen
@@ -694,23 +783,20 @@ def dry_audit_wake(session: dict, context: dict, modules: dict):
         {"area": "templates", "path": f"{citizen_code}/templates", "patterns": ["*.json"]},
     ]
     
-    # Pick next area to audit
-    last_area = last_audit.get("last_area", "")
-    area_names = [a["area"] for a in audit_areas]
-    if last_area in area_names:
-        next_idx = (area_names.index(last_area) + 1) % len(audit_areas)
-    else:
-        next_idx = 0
+    # Pick next area to audit (rotation index; pre-index trackers stored the name)
+    last_idx = last_audit.get("idx")
+    if last_idx is None:
+        area_names = [a["area"] for a in audit_areas]
+        last_area = last_audit.get("last_area", "")
+        last_idx = area_names.index(last_area) if last_area in area_names else -1
+    next_idx = (last_idx + 1) % len(audit_areas)
     audit_target = audit_areas[next_idx]
     
     # Format open violations
     open_violations = violations.get("open", [])
-    open_text = ""
-    if open_violations:
-        for v in open_violations[:5]:
-            open_text += f"\n  [{v.get('severity', '?')}] {v.get('file', '?')}: {v.get('description', '')[:60]}"
-    else:
-        open_text = "\n  (no known open violations)"
+    open_text = "".join(
+        f"\n  [{v.get('severity', '?')}] {v.get('file', '?')}: {v.get('description', '')[:60]}"
+        for v in open_violations[:5]) or "\n  (no known open violations)"
     
     prompt = f"""
 === DRY AUDIT WAKE ===
@@ -766,11 +852,11 @@ Remember: You are the immune system. DRY violations are cancer cells. Hunt them.
     # Update last audit tracking
     violations["last_audit"][citizen] = {
         "timestamp": now_iso(),
-        "last_area": audit_target["area"],
+        "idx": next_idx,
         "last_file_checked": ""
     }
     violations_file.parent.mkdir(parents=True, exist_ok=True)
-    violations_file.write_text(json.dumps(violations, indent=2))
+    write_json(violations_file, violations, compact=True)
     
     result = modules["council"].process(prompt, session, session["config"]["council"], modules)
     return result
@@ -784,43 +870,46 @@ def _save_session_progress(session: dict, modules: dict):
     citizen_home = session["citizen_home"]
     task_id = session["active_task"]["id"]
     progress_file = citizen_home / "tasks" / "active" / f"{task_id}_progress.json"
+    _now = now_iso()
     
-    if progress_file.exists():
-        progress = json.loads(progress_file.read_text())
-    else:
+    progress = _load_json_or(progress_file)
+    if progress is None:
         # NOTE: No progress_pct! Derived from steps.
-        progress = {"task_id": task_id, "steps": [], "action_log": []}
-    
-    # Ensure we have action_log (separate from steps)
-    if "action_log" not in progress:
-        progress["action_log"] = []
+        progress = {"task_id": task_id, "steps": []}
     
     # Update with session info
     progress["last_session"] = {
-        "ended": now_iso(),
+        "ended": _now,
         "reason": "session_end",
         "tokens_used": session.get("tokens_used", 0),
         "last_action": session.get("actions", [{}])[-1].get("tool", "unknown") if session.get("actions") else "none"
     }
     
-    # Add recent actions to action_log (not steps)
+    # Recent actions go to the append-only action log (not steps).
+    # Older progress files kept the log inline - migrate it out once.
+    action_file = progress_file.with_name(f"{task_id}_actions.jsonl")
+    records = progress.pop("action_log", [])[-ACTION_LOG_KEEP:]
     for action in session.get("actions", [])[-10:]:
-        progress["action_log"].append({
-            "time": action.get("time", now_iso()),
+        records.append({
+            "time": action.get("time", _now),
             "action": action.get("tool", "unknown"),
             "note": str(action.get("result", ""))[:200]
         })
+    if records:
+        _append_jsonl(action_file, records)
+        # Keep action log bounded - line count is tracked, not re-read
+        lines = progress.get("action_log_lines", 0) + len(records)
+        if lines > ACTION_LOG_COMPACT_AT:
+            _compact_jsonl(action_file, ACTION_LOG_KEEP)
+            lines = ACTION_LOG_KEEP
+        progress["action_log_lines"] = lines
     
-    # Keep action_log bounded
-    if len(progress["action_log"]) > 50:
-        progress["action_log"] = progress["action_log"][-50:]
-    
-    progress_file.write_text(json.dumps(progress, indent=2))
+    write_json(progress_file, progress, compact=True)
 
 
 def peer_monitor_wake(session: dict, modules: dict):
     """
-    Peer monitoring wake - check a random peer for problems.
+    Peer monitoring wake - check the next peer (round-robin) for problems.
     
     Runs 1 in 10 wakes. Looks for:
     - Looping behavior (same actions repeated)
@@ -834,7 +923,7 @@ def peer_monitor_wake(session: dict, modules: dict):
     citizen_home = session["citizen_home"]
     session["wake_type"] = "PEER_MONITOR"  # For tool filtering
     
-    # Pick a random peer
+    # Pick the next peer in rotation
     all_citizens = ["opus", "mira", "aria"]
     peers = [c for c in all_citizens if c != citizen]
     
@@ -842,7 +931,15 @@ def peer_monitor_wake(session: dict, modules: dict):
         print("[PEER MONITOR] No peers to monitor")
         return
     
-    peer = random.choice(peers)
+    # Advance before gathering so an unreadable peer can't stall the rotation
+    state_file = citizen_home / "peer_monitor_state.json"
+    try:
+        state = read_json(state_file)
+    except (OSError, ValueError):
+        state = {}
+    idx = (state.get("idx", -1) + 1) % len(peers)
+    peer = peers[idx]
+    write_json(state_file, {"idx": idx}, compact=True)
     peer_home = Path(f"/home/{peer}")
     
     print(f"[PEER MONITOR] Checking {peer}...")
@@ -918,7 +1015,7 @@ def gather_peer_data(peer: str, peer_home: Path) -> dict:
     wake_log_file = peer_home / "wake_log.json"
     if wake_log_file.exists():
         try:
-            wake_log = json.loads(wake_log_file.read_text())
+            wake_log = read_json(wake_log_file)
             # Use total_wakes if present, not len()
             if "total_wakes" in wake_log:
                 data["wake_count"] = wake_log["total_wakes"]
@@ -937,43 +1034,46 @@ def gather_peer_data(peer: str, peer_home: Path) -> dict:
         except:
             data["wake_count"] = 0
             data["recent_wakes"] = 0
-    else:
-        # Fallback to metadata for old citizens
-        metadata_file = peer_home / "metadata.json"
-        if metadata_file.exists():
-            metadata = json.loads(metadata_file.read_text())
-            data["wake_count"] = metadata.get("wake_count", 0)
-        data["recent_wakes"] = 0
     
-    # Load last_wake from metadata (still useful for quick check)
-    metadata_file = peer_home / "metadata.json"
-    if metadata_file.exists():
-        metadata = json.loads(metadata_file.read_text())
+    metadata = _load_json_or(peer_home / "metadata.json")
+    if metadata is not None:
+        if "wake_count" not in data:
+            # Fallback to metadata for old citizens
+            data["wake_count"] = metadata.get("wake_count", 0)
+        # last_wake from metadata (still useful for quick check)
         data["last_wake"] = metadata.get("last_wake")
+    data.setdefault("recent_wakes", 0)
     
     # Check active task
     active_dir = peer_home / "tasks" / "active"
     if active_dir.exists():
         active_tasks = [f for f in active_dir.glob("*.json") if not f.name.endswith("_progress.json")]
         if active_tasks:
-            data["active_task"] = json.loads(active_tasks[0].read_text())
+            data["active_task"] = read_json(active_tasks[0])
             progress_file = active_tasks[0].with_name(f"{data['active_task']['id']}_progress.json")
-            if progress_file.exists():
-                data["active_task"]["_progress"] = json.loads(progress_file.read_text())
+            progress = _load_json_or(progress_file)
+            # The action log lives in the _actions.jsonl sidecar; show it inline
+            # as before so the monitor can spot loops
+            action_log = _tail_jsonl(progress_file.with_name(f"{data['active_task']['id']}_actions.jsonl"), ACTION_LOG_KEEP)
+            if action_log:
+                progress = progress if progress is not None else {}
+                progress["action_log"] = (progress.get("action_log", []) + action_log)[-ACTION_LOG_KEEP:]
+            if progress is not None:
+                data["active_task"]["_progress"] = progress
     
     # Recent completions
     done_dir = peer_home / "tasks" / "done"
     if done_dir.exists():
         done_files = sorted(done_dir.glob("*.json"), key=lambda f: f.stat().st_mtime, reverse=True)
         done_files = [f for f in done_files if not f.name.endswith("_progress.json")][:5]
-        data["completions"] = [json.loads(f.read_text()) for f in done_files]
+        data["completions"] = [read_json(f) for f in done_files]
     
     # Recent failures
     failed_dir = peer_home / "tasks" / "failed"
     if failed_dir.exists():
         failed_files = sorted(failed_dir.glob("*.json"), key=lambda f: f.stat().st_mtime, reverse=True)
         failed_files = [f for f in failed_files if not f.name.endswith("_progress.json")][:5]
-        data["failures"] = [json.loads(f.read_text()) for f in failed_files]
+        data["failures"] = [read_json(f) for f in failed_files]
     
     return data
 
@@ -1015,14 +1115,14 @@ def save_peer_monitor_result(session: dict, peer: str, result: str, peer_data: d
     """Save monitoring result to peer_monitor context."""
     citizen_home = session["citizen_home"]
     monitor_file = citizen_home / "contexts" / "peer_monitor.json"
+    _now = now_iso()
     
-    if monitor_file.exists():
-        ctx = json.loads(monitor_file.read_text())
-    else:
+    ctx = _load_json_or(monitor_file)
+    if ctx is None:
         ctx = {
             "id": f"{session['citizen']}_peer_monitor",
             "context_type": "peer_monitor",
-            "created": now_iso(),
+            "created": _now,
             "max_tokens": 8000,
             "messages": []
         }
@@ -1030,7 +1130,7 @@ def save_peer_monitor_result(session: dict, peer: str, result: str, peer_data: d
     # Add this monitoring result
     entry = {
         "role": "assistant",
-        "content": f"[MONITOR {peer} @ {now_iso()}]\n{result[:1500]}"
+        "content": f"[MONITOR {peer} @ {_now}]\n{result[:1500]}"
     }
     ctx["messages"].append(entry)
     
@@ -1038,10 +1138,10 @@ def save_peer_monitor_result(session: dict, peer: str, result: str, peer_data: d
     if len(ctx["messages"]) > 10:
         ctx["messages"] = ctx["messages"][-10:]
     
-    ctx["last_modified"] = now_iso()
+    ctx["last_modified"] = _now
     ctx["token_count"] = sum(len(m.get("content", "")) // 4 for m in ctx["messages"])
     
-    monitor_file.write_text(json.dumps(ctx, indent=2))
+    write_json(monitor_file, ctx)
 
 
 def alert_about_peer(session: dict, peer: str, analysis: str, modules: dict):
@@ -1141,15 +1241,12 @@ def log_structured_wake(citizen_home: Path, entry: dict):
     log_dir = citizen_home / "logs"
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / "structured_wakes.json"
-    if log_file.exists():
-        logs = json.loads(log_file.read_text())
-    else:
-        logs = []
+    logs = _load_json_or(log_file, [])
     logs.append(entry)
     # Keep last 100 entries
     if len(logs) > 100:
         logs = logs[-100:]
-    log_file.write_text(json.dumps(logs, indent=2))
+    write_json(log_file, logs)
 
 
 # =============================================================================
@@ -1158,46 +1255,62 @@ def log_structured_wake(citizen_home: Path, entry: dict):
 
 def _search_related_experiences(citizen: str, task_description: str) -> str:
     """Search for experiences related to a task description."""
+    # Cache key tracks the experience index on disk, so any add/compress
+    # (from whatever module) invalidates it; the date rolls the 90-day window.
+    index_file = Path(f"/home/{citizen}/experiences/index.json")
     try:
-        from experiences import ExperienceStore
-        store = ExperienceStore(citizen)
-        
-        # Extract keywords from task description
-        words = task_description.lower().split()
-        # Filter to meaningful words
-        stop_words = {"the", "a", "an", "is", "are", "to", "for", "and", "or", "with", "this", "that"}
-        keywords = [w for w in words if len(w) > 2 and w not in stop_words]
-        
-        if not keywords:
-            return ""
-        
-        # Search with keywords
-        query = " ".join(keywords[:5])  # Max 5 keywords
-        results = store.search(query, limit=3, days=90)  # Last 90 days
-        
-        if not results:
-            return ""
-        
-        # Format results
-        lines = []
-        for r in results:
-            lines.append(f"  [{r['category']}] {r['summary'][:150]}")
-            if r.get('keywords'):
-                lines.append(f"    Keywords: {', '.join(r['keywords'][:5])}")
-        
-        return "\n".join(lines)
+        st = index_file.stat()
+        index_state = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        index_state = None
+    today = datetime.now(timezone.utc).date().isoformat()
+    try:
+        return _search_related_cached(citizen, task_description, index_state, today)
     except Exception as e:
         print(f"[WARN] Experience search failed: {e}")
         return ""
 
 
+@lru_cache(maxsize=512)
+def _search_related_cached(citizen: str, task_description: str,
+                           index_state: tuple, today: str) -> str:
+    """Experience search for _search_related_experiences (memoized)."""
+    from experiences import get_store
+    store = get_store(citizen)
+    
+    # Extract keywords from task description
+    words = task_description.lower().split()
+    # Filter to meaningful words
+    stop_words = {"the", "a", "an", "is", "are", "to", "for", "and", "or", "with", "this", "that"}
+    keywords = [w for w in words if len(w) > 2 and w not in stop_words]
+    
+    if not keywords:
+        return ""
+    
+    # Search with keywords
+    query = " ".join(keywords[:5])  # Max 5 keywords
+    results = store.search(query, limit=3, days=90)  # Last 90 days
+    
+    if not results:
+        return ""
+    
+    # Format results
+    lines = []
+    for r in results:
+        lines.append(f"  [{r['category']}] {r['summary'][:150]}")
+        if r.get('keywords'):
+            lines.append(f"    Keywords: {', '.join(r['keywords'][:5])}")
+    
+    return "\n".join(lines)
+
+
 def _capture_task_experience(session: dict, task: dict, result: dict):
     """Capture experience from completed task."""
     try:
-        from experiences import ExperienceStore
+        from experiences import get_store
         
         citizen = session["citizen"]
-        store = ExperienceStore(citizen)
+        store = get_store(citizen)
         
         # Determine outcome
         result_text = result.get("text", "")
@@ -1321,7 +1434,7 @@ This is infrastructure knowledge - you're learning your own "body".
     if pending_dir.exists():
         for pr_file in pending_dir.glob("pr_*.json"):
             try:
-                pr = json.loads(pr_file.read_text())
+                pr = read_json(pr_file)
                 if pr.get("module_name") == area:
                     pr_created = True
                     print(f"[BOOTSTRAP] PR created for {area}")
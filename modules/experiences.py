@@ -20,6 +20,7 @@ Structure:
 import json
 import os
 import re
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -28,6 +29,26 @@ def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
 
+# Common words dropped from auto-extracted keywords
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would", "could",
+    "should", "may", "might", "must", "shall", "can", "need", "dare",
+    "to", "of", "in", "for", "on", "with", "at", "by", "from", "as",
+    "into", "through", "during", "before", "after", "above", "below",
+    "between", "under", "again", "further", "then", "once", "here",
+    "there", "when", "where", "why", "how", "all", "each", "few",
+    "more", "most", "other", "some", "such", "no", "nor", "not",
+    "only", "own", "same", "so", "than", "too", "very", "just",
+    "and", "but", "if", "or", "because", "until", "while", "this",
+    "that", "these", "those", "i", "me", "my", "myself", "we", "our",
+    "you", "your", "he", "him", "his", "she", "her", "it", "its",
+    "they", "them", "their", "what", "which", "who", "whom"
+})
+
+_KEYWORD_RE = re.compile(r'\b[a-zA-Z_][a-zA-Z0-9_]{2,}\b')
+
+
 class ExperienceStore:
     """Store and search personal experiences."""
     
@@ -39,6 +60,21 @@ class ExperienceStore:
         self.compressed_dir = self.base_dir / "compressed"
         self._ensure_dirs()
         self.index = self._load_index()
+        self._stat = self._index_stat()
+    
+    def _index_stat(self):
+        try:
+            st = self.index_file.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    def refresh(self):
+        """Reload the index if it changed on disk since we last read/wrote it."""
+        stat = self._index_stat()
+        if stat != self._stat:
+            self.index = self._load_index()
+            self._stat = stat
     
     def _ensure_dirs(self):
         """Create directory structure."""
@@ -65,6 +101,7 @@ class ExperienceStore:
     def _save_index(self):
         """Save index."""
         self.index_file.write_text(json.dumps(self.index, indent=2))
+        self._stat = self._index_stat()
     
     def add(self, content: str, category: str = "general", 
             summary: str = None, keywords: List[str] = None,
@@ -125,31 +162,14 @@ class ExperienceStore:
     
     def _extract_keywords(self, content: str) -> List[str]:
         """Extract searchable keywords from content."""
-        # Remove common words, keep meaningful ones
-        stop_words = {
-            "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
-            "have", "has", "had", "do", "does", "did", "will", "would", "could",
-            "should", "may", "might", "must", "shall", "can", "need", "dare",
-            "to", "of", "in", "for", "on", "with", "at", "by", "from", "as",
-            "into", "through", "during", "before", "after", "above", "below",
-            "between", "under", "again", "further", "then", "once", "here",
-            "there", "when", "where", "why", "how", "all", "each", "few",
-            "more", "most", "other", "some", "such", "no", "nor", "not",
-            "only", "own", "same", "so", "than", "too", "very", "just",
-            "and", "but", "if", "or", "because", "until", "while", "this",
-            "that", "these", "those", "i", "me", "my", "myself", "we", "our",
-            "you", "your", "he", "him", "his", "she", "her", "it", "its",
-            "they", "them", "their", "what", "which", "who", "whom"
-        }
-        
         # Extract words
-        words = re.findall(r'\b[a-zA-Z_][a-zA-Z0-9_]{2,}\b', content.lower())
+        words = _KEYWORD_RE.findall(content.lower())
         
         # Filter and dedupe
         keywords = []
         seen = set()
         for word in words:
-            if word not in stop_words and word not in seen:
+            if word not in _STOP_WORDS and word not in seen:
                 seen.add(word)
                 keywords.append(word)
         
@@ -301,10 +321,35 @@ class ExperienceStore:
         self._save_index()
 
 
+@lru_cache(maxsize=32)
+def _cached_store(citizen: str) -> ExperienceStore:
+    return ExperienceStore(citizen)
+
+
+def get_store(citizen: str) -> ExperienceStore:
+    """Shared per-citizen store - index parsed once, re-read only if it changed."""
+    store = _cached_store(citizen)
+    store.refresh()
+    return store
+
+
 # =============================================================================
 # Auto-capture from wakes
 # =============================================================================
 
+# Wake action -> experience category
+_ACTION_CATEGORY = {
+    "code": "code",
+    "debug": "debug",
+    "self_improve": "meta",
+    "research": "research",
+    "reflection": "reflection",
+    "peer_monitor": "social",
+    "help_peer": "social",
+    "process_email": "communication",
+}
+
+
 def capture_wake_experience(session: dict, outcome: str, learnings: str = None):
     """
     Called at end of wake to capture what was learned.
@@ -318,7 +363,7 @@ def capture_wake_experience(session: dict, outcome: str, learnings: str = None):
     if not citizen:
         return
     
-    store = ExperienceStore(citizen)
+    store = get_store(citizen)
     
     # Build content from session
     action = session.get("action", "unknown")
@@ -348,17 +393,7 @@ def capture_wake_experience(session: dict, outcome: str, learnings: str = None):
     content = "\n".join(content_parts)
     
     # Determine category
-    category_map = {
-        "code": "code",
-        "debug": "debug",
-        "self_improve": "meta",
-        "research": "research",
-        "reflection": "reflection",
-        "peer_monitor": "social",
-        "help_peer": "social",
-        "process_email": "communication",
-    }
-    category = category_map.get(action, "general")
+    category = _ACTION_CATEGORY.get(action, "general")
     
     # Add experience
     store.add(
@@ -382,7 +417,7 @@ def experience_add(args: dict, session: dict, modules: dict) -> str:
     if not content:
         return "ERROR: Content required"
     
-    store = ExperienceStore(session["citizen"])
+    store = get_store(session["citizen"])
     exp_id = store.add(
         content=content,
         category=args.get("category", "general"),
@@ -399,7 +434,7 @@ def experience_search(args: dict, session: dict, modules: dict) -> str:
     if not query:
         return "ERROR: Query required"
     
-    store = ExperienceStore(session["citizen"])
+    store = get_store(session["citizen"])
     results = store.search(
         query=query,
         category=args.get("category"),
@@ -410,14 +445,12 @@ def experience_search(args: dict, session: dict, modules: dict) -> str:
     if not results:
         return f"No experiences found for: {query}"
     
-    lines = [f"=== {len(results)} RESULTS for '{query}' ===", ""]
-    for r in results:
-        lines.append(f"  [{r['id']}] ({r['category']}) score={r['score']}")
-        lines.append(f"    {r['summary'][:80]}")
-        lines.append(f"    Keywords: {', '.join(r.get('keywords', [])[:5])}")
-        lines.append("")
-    
-    return "\n".join(lines)
+    header = f"=== {len(results)} RESULTS for '{query}' ==="
+    return header + "\n\n" + "\n".join(
+        f"  [{r['id']}] ({r['category']}) score={r['score']}\n"
+        f"    {r['summary'][:80]}\n"
+        f"    Keywords: {', '.join(r.get('keywords', [])[:5])}\n"
+        for r in results)
 
 
 def experience_get(args: dict, session: dict, modules: dict) -> str:
@@ -426,7 +459,7 @@ def experience_get(args: dict, session: dict, modules: dict) -> str:
     if not exp_id:
         return "ERROR: ID required"
     
-    store = ExperienceStore(session["citizen"])
+    store = get_store(session["citizen"])
     exp = store.get(exp_id)
     
     if not exp:
@@ -443,13 +476,13 @@ Keywords: {', '.join(exp.get('keywords', []))}
 
 def experience_stats(args: dict, session: dict, modules: dict) -> str:
     """Get experience statistics."""
-    store = ExperienceStore(session["citizen"])
+    store = get_store(session["citizen"])
     return store.get_stats()
 
 
 def experience_recent(args: dict, session: dict, modules: dict) -> str:
     """Get recent experiences."""
-    store = ExperienceStore(session["citizen"])
+    store = get_store(session["citizen"])
     recent = store.get_recent(
         limit=args.get("limit", 10),
         category=args.get("category")
@@ -458,13 +491,10 @@ def experience_recent(args: dict, session: dict, modules: dict) -> str:
     if not recent:
         return "No recent experiences."
     
-    lines = ["=== RECENT EXPERIENCES ===", ""]
-    for r in recent:
-        lines.append(f"  [{r['id']}] ({r['category']})")
-        lines.append(f"    {r['summary'][:80]}")
-        lines.append("")
-    
-    return "\n".join(lines)
+    return "=== RECENT EXPERIENCES ===\n\n" + "\n".join(
+        f"  [{r['id']}] ({r['category']})\n"
+        f"    {r['summary'][:80]}\n"
+        for r in recent)
 
 
 EXPERIENCE_TOOL_DEFINITIONS = [
@@ -5,47 +5,124 @@ Problem: AI loops endlessly on broken things (e.g., misconfigured email).
 Solution: Track failures, auto-create GitHub issue after 3 failures.
 """
 
+import atexit
 import json
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    from json_io import dumps, read_json, write_atomic
+except ImportError:
+    from modules.json_io import dumps, read_json, write_atomic
+
 
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
 
+def _error_count(errors: list) -> int:
+    """Failures recorded in an errors list (entries may be run-length encoded)."""
+    return sum(e.get("count", 1) for e in errors)
+
+
+# gh issue creation runs here so record_failure never blocks on it
+_ESCALATION_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="escalate")
+
+
 class FailureTracker:
     """Track repeated failures and auto-escalate."""
     
     MAX_FAILURES = 3  # Auto-escalate after this many
+    FLUSH_INTERVAL = 0.5  # Seconds - failures inside this window share one write
+    KEY_CACHE_SIZE = 512
+    _KEY_CACHE = {}  # operation -> normalized key, shared by all trackers
     
     def __init__(self, citizen: str):
         self.citizen = citizen
         self.file = Path(f"/home/{citizen}/failure_tracking.json")
         self.data = self._load()
+        self._stat = self._file_stat()
+        self._dirty = False
+        self._last_flush = 0.0
+        self._last_written = None
+        self._lock = threading.RLock()  # Escalation threads save too
+    
+    def _file_stat(self):
+        try:
+            st = self.file.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    def refresh(self):
+        """Reload from disk if the file changed since we last read/wrote it."""
+        if self._dirty:
+            return  # Unflushed changes are newer than the file
+        stat = self._file_stat()
+        if stat != self._stat:
+            self.data = self._load()
+            self._stat = stat
+    
+    def reload(self):
+        """Re-read from disk unconditionally; unwritten changes are discarded (the file wins)."""
+        with self._lock:
+            self._dirty = False
+            self.data = self._load()
+            self._stat = self._file_stat()
+            self._last_written = None
     
     def _load(self) -> dict:
-        if self.file.exists():
-            try:
-                return json.loads(self.file.read_text())
-            except:
-                return {}
-        return {}
-    
-    def _save(self):
+        # One open, no exists() stat; orjson/json decode errors are ValueErrors
+        try:
+            return read_json(self.file)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save(self, force: bool = False):
+        """Mark dirty; write now if forced or the last write is old enough."""
+        self._dirty = True
+        if force or time.monotonic() - self._last_flush > self.FLUSH_INTERVAL:
+            self.flush()
+    
+    def flush(self):
+        """Write pending changes (atomic tmp + rename)."""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        if not self._dirty:
+            return
+        # Machine-read, rewritten as failures come in: compact, no indent
+        payload = dumps(self.data, compact=True)
+        self._dirty = False
+        if payload == self._last_written and self._file_stat() == self._stat:
+            return  # File already holds exactly this
         self.file.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.file.with_suffix('.tmp')
-        tmp.write_text(json.dumps(self.data, indent=2))
-        tmp.rename(self.file)
+        # Atomic swap, deliberately without fsync: a crash may lose the
+        # latest failures but never leaves a torn file
+        write_atomic(self.file, payload)
+        self._last_written = payload
+        self._stat = self._file_stat()
+        self._last_flush = time.monotonic()
     
     def _normalize_key(self, operation: str) -> str:
         """Normalize operation to consistent key."""
+        # Same few operations fail over and over - reuse their keys
+        key = self._KEY_CACHE.get(operation)
+        if key is not None:
+            return key
         # Remove dynamic parts like timestamps, specific args
         key = operation.lower().strip()
         # Truncate long operations
         if len(key) > 50:
             key = key[:50]
+        if len(self._KEY_CACHE) >= self.KEY_CACHE_SIZE:
+            self._KEY_CACHE.pop(next(iter(self._KEY_CACHE)))  # FIFO
+        self._KEY_CACHE[operation] = key
         return key
     
     def record_failure(self, operation: str, error: str) -> str:
@@ -56,41 +133,48 @@ class FailureTracker:
             None if still trying
             Escalation message if auto-escalated
         """
-        key = self._normalize_key(operation)
-        
-        # Skip if already escalated
-        if key in self.data and self.data[key].get("escalated"):
-            return f"Already escalated. See issue: {self.data[key].get('issue_url', 'unknown')}"
-        
-        # Initialize or update
-        if key not in self.data:
-            self.data[key] = {
-                # NOTE: No count field! Derived from len(errors).
-                "errors": [],
-                "first_seen": now_iso(),
-                "escalated": False
-            }
-        
-        # Add error
-        self.data[key]["last_seen"] = now_iso()
-        self.data[key]["errors"].append({
-            "error": error[:500],  # Truncate
-            "time": now_iso()
-        })
-        
-        # Keep only last N errors (where N >= MAX_FAILURES so we can count)
-        self.data[key]["errors"] = self.data[key]["errors"][-10:]
-        
-        self._save()
-        
-        # DRY: count is derived from len(errors)
-        error_count = len(self.data[key]["errors"])
-        
-        # Check for auto-escalate
-        if error_count >= self.MAX_FAILURES:
-            return self._auto_escalate(key)
-        
-        return None
+        with self._lock:
+            key = self._normalize_key(operation)
+            
+            # Skip if already escalated
+            if key in self.data and self.data[key].get("escalated"):
+                return f"Already escalated. See issue: {self.data[key].get('issue_url', 'unknown')}"
+            
+            # Initialize or update
+            if key not in self.data:
+                self.data[key] = {
+                    # NOTE: No count field! Derived from errors.
+                    "errors": [],
+                    "first_seen": now_iso(),
+                    "escalated": False
+                }
+            
+            # Add error - run-length encoded: a repeat of the previous
+            # error bumps its count instead of adding an entry
+            _now = now_iso()
+            error = error[:500]  # Truncate
+            errors = self.data[key]["errors"]
+            self.data[key]["last_seen"] = _now
+            if errors and errors[-1]["error"] == error:
+                last = errors[-1]
+                last.setdefault("first_time", last["time"])
+                last["count"] = last.get("count", 1) + 1
+                last["time"] = _now
+            else:
+                errors.append({"error": error, "time": _now})
+                # Keep only last N distinct errors
+                del errors[:-10]
+            
+            self._save()
+            
+            # DRY: count is derived from errors
+            error_count = _error_count(errors)
+            
+            # Check for auto-escalate
+            if error_count >= self.MAX_FAILURES:
+                return self._auto_escalate(key)
+            
+            return None
     
     def _auto_escalate(self, key: str) -> str:
         """Create GitHub issue for repeated failure."""
@@ -99,6 +183,7 @@ class FailureTracker:
         # Build issue
         errors_text = "\n".join(
             f"  [{e['time'][:19]}] {e['error'][:100]}"
+            + (f" (x{e['count']} since {e['first_time'][:19]})" if e.get("count", 1) > 1 else "")
             for e in failure_data["errors"][-3:]
         )
         
@@ -106,7 +191,7 @@ class FailureTracker:
 
 **Citizen:** {self.citizen}
 **Operation:** `{key}`
-**Failure count:** {failure_data['count']}
+**Failure count:** {_error_count(failure_data['errors'])}
 **First seen:** {failure_data['first_seen']}
 **Last seen:** {failure_data['last_seen']}
 
@@ -126,7 +211,16 @@ class FailureTracker:
 - `{self.citizen}`
 """
         
-        # Create issue
+        # Mark escalated now so retries stop immediately; the issue itself
+        # is filed in the background (gh can take up to 30s)
+        self.data[key]["escalated"] = True
+        self._save(force=True)
+        _ESCALATION_POOL.submit(self._file_issue, key, issue_body)
+        
+        return "AUTO-ESCALATED: Filing GitHub issue in background.\nStop retrying this operation until issue is resolved."
+    
+    def _file_issue(self, key: str, issue_body: str):
+        """Create the GitHub issue (runs on _ESCALATION_POOL)."""
         try:
             result = subprocess.run(
                 ["gh", "issue", "create",
@@ -141,13 +235,11 @@ class FailureTracker:
             )
             
             issue_url = result.stdout.strip()
+            print(f"[ESCALATION] {self.citizen}/{key}: created {issue_url}")
             
-            # Mark escalated
-            self.data[key]["escalated"] = True
-            self.data[key]["issue_url"] = issue_url
-            self._save()
-            
-            return f"AUTO-ESCALATED: Created {issue_url}\nStop retrying this operation until issue is resolved."
+            with self._lock:
+                self.data[key]["issue_url"] = issue_url
+                self._save(force=True)
             
         except Exception as e:
             # Fallback: write to local file for admin
@@ -164,28 +256,26 @@ class FailureTracker:
             alerts.append({
                 "citizen": self.citizen,
                 "operation": key,
-                "failure_data": failure_data,
+                "failure_data": self.data[key],
                 "github_error": str(e),
                 "time": now_iso()
             })
             
             alert_file.write_text(json.dumps(alerts, indent=2))
-            
-            self.data[key]["escalated"] = True
-            self._save()
-            
-            return f"AUTO-ESCALATED (local): Wrote to alerts file. GitHub unavailable: {e}"
+            print(f"[ESCALATION] {self.citizen}/{key}: GitHub unavailable ({e}), wrote to alerts file")
     
     def record_success(self, operation: str):
         """Record success - resets failure count."""
-        key = self._normalize_key(operation)
-        
-        if key in self.data:
-            # Don't fully delete - keep for history
-            self.data[key]["count"] = 0
-            self.data[key]["last_success"] = now_iso()
-            self.data[key]["escalated"] = False  # Can re-escalate if breaks again
-            self._save()
+        with self._lock:
+            key = self._normalize_key(operation)
+            
+            if key in self.data:
+                # Don't fully delete - keep for history. Count is derived from errors,
+                # so clearing them is the reset.
+                self.data[key]["errors"] = []
+                self.data[key]["last_success"] = now_iso()
+                self.data[key]["escalated"] = False  # Can re-escalate if breaks again
+                self._save(force=True)
     
     def is_escalated(self, operation: str) -> bool:
         """Check if operation is already escalated."""
@@ -195,22 +285,67 @@ class FailureTracker:
     def get_failure_count(self, operation: str) -> int:
         """Get current failure count for operation."""
         key = self._normalize_key(operation)
-        return self.data.get(key, {}).get("count", 0)
+        # DRY: count is derived from errors
+        return _error_count(self.data.get(key, {}).get("errors", []))
+
+
+_TRACKERS = {}  # citizen -> live FailureTracker (never evicted while it may be dirty)
+_TRACKERS_LOCK = threading.Lock()
+
+
+def _cached_tracker(citizen: str) -> FailureTracker:
+    with _TRACKERS_LOCK:
+        tracker = _TRACKERS.get(citizen)
+        if tracker is None:
+            tracker = _TRACKERS[citizen] = FailureTracker(citizen)
+        return tracker
+
+
+def _get_tracker(citizen: str) -> FailureTracker:
+    """Shared per-citizen tracker - parsed once, re-read only if the file changed."""
+    tracker = _cached_tracker(citizen)
+    tracker.refresh()
+    return tracker
+
+
+@atexit.register
+def _flush_trackers():
+    """Write debounced failures of the live trackers (dropped ones were flushed already)."""
+    with _TRACKERS_LOCK:
+        trackers = list(_TRACKERS.values())
+    for tracker in trackers:
+        tracker.flush()
+
+
+def invalidate(citizen: str = None):
+    """
+    Drop cached tracker(s), e.g. after editing failure_tracking.json by hand.
+    
+    With a citizen, its tracker re-reads the file now, discarding failures
+    not yet written. Without, every tracker is flushed and dropped.
+    """
+    if citizen is None:
+        # Flush before dropping, so no stale tracker is left holding writes
+        _flush_trackers()
+        with _TRACKERS_LOCK:
+            _TRACKERS.clear()
+    else:
+        with _TRACKERS_LOCK:
+            tracker = _TRACKERS.get(citizen)
+        if tracker is not None:
+            tracker.reload()
 
 
 def track_failure(citizen: str, operation: str, error: str) -> str:
     """Convenience function to track a failure."""
-    tracker = FailureTracker(citizen)
-    return tracker.record_failure(operation, error)
+    return _get_tracker(citizen).record_failure(operation, error)
 
 
 def track_success(citizen: str, operation: str):
     """Convenience function to track success."""
-    tracker = FailureTracker(citizen)
-    tracker.record_success(operation)
+    _get_tracker(citizen).record_success(operation)
 
 
 def check_escalated(citizen: str, operation: str) -> bool:
     """Check if an operation is escalated (should not retry)."""
-    tracker = FailureTracker(citizen)
-    return tracker.is_escalated(operation)
+    return _get_tracker(citizen).is_escalated(operation)
@@ -10,19 +10,82 @@ This is the hardest part of the system. It must:
 Uses Opus model for forgetting decisions - this is judgment work.
 """
 
-import json
+import fcntl
+import hashlib
+import heapq
 import os
+import re
+import threading
+import time
 import anthropic
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Optional
 
+# Optional: SIMD hash for dedup fingerprints (pip install blake3)
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Optional: local ONNX embeddings for semantic near-duplicates (pip install fastembed)
+# Without it, near-duplicates are messages sharing a normalized 500-char prefix
+try:
+    import numpy as np
+    from fastembed import TextEmbedding
+    FASTEMBED_AVAILABLE = True
+except ImportError:
+    FASTEMBED_AVAILABLE = False
+
+# Same tokenizer context_mgr uses to fill token_count (tiktoken, char/4 fallback)
+try:
+    from context_mgr import count_tokens, count_tokens_batch, context_texts
+except ImportError:
+    from modules.context_mgr import count_tokens, count_tokens_batch, context_texts
+
+try:
+    from json_io import dumps, read_json, write_atomic, write_json
+except ImportError:
+    from modules.json_io import dumps, read_json, write_atomic, write_json
+
 # Model selection for forgetting
 # Sonnet for normal compression (cost effective, follows instructions well)
 # Opus only for escalation (when first pass fails or for identity context)
 FORGET_MODEL_DEFAULT = "claude-sonnet-4-5-20250929"
 FORGET_MODEL_ESCALATE = "claude-opus-4-5-20251101"
 
+# Semantic dedup: same model as prompt_compressor; cosine >= threshold is a duplicate
+SEMANTIC_DEDUP_MODEL = "BAAI/bge-small-en-v1.5"
+SEMANTIC_DEDUP_THRESHOLDS = {"identity": 0.98, "default": 0.92}
+EMBED_CACHE_SIZE = 4096
+EMBED_BATCH_SIZE = 64
+TOKEN_CACHE_SIZE = 16384
+
+# Compression output cap, lowered when the input leaves less room in the window
+COMPRESS_MAX_OUTPUT = 2000
+COMPRESS_MIN_OUTPUT = 256
+MODEL_CONTEXT_WINDOW = 200000
+PROMPT_OVERHEAD = 2048  # System prompt, block framing, tokenizer drift
+
+# Re-dedup before compressing only once a context has grown past this since last time
+DEDUP_REGROWTH = 1.05
+DEDUP_REGROWTH_MSGS = 8
+DEDUP_RAW_HASH_OVER = 65536  # chars; larger bodies hash as-is, unnormalized
+
+# page_oldest: recent non-system messages that always stay resident
+PAGE_KEEP_RECENT = 6
+_PAGE_ID_RE = re.compile(r"pg_[\w-]+")
+
+# Contexts compressed concurrently per wake (each pass is API-latency bound).
+# The SDK retries 429/5xx itself with exponential backoff, honouring retry-after.
+FORGET_WORKERS = 4
+FORGET_MAX_RETRIES = 3
+
 COSTS = {
     "claude-opus-4-5-20251101": {"input": 15.0, "output": 75.0},
     "claude-sonnet-4-5-20250929": {"input": 3.0, "output": 15.0},
@@ -37,14 +100,18 @@ def get_client():
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         raise RuntimeError("ANTHROPIC_API_KEY not set")
-    return anthropic.Anthropic(api_key=api_key)
+    return anthropic.Anthropic(api_key=api_key, max_retries=FORGET_MAX_RETRIES)
+
+# Guards session cost/action accounting when contexts are forgotten in parallel
+_SESSION_LOCK = threading.Lock()
 
-def maybe_forget(ctx: dict, config: dict, session: dict):
+def maybe_forget(ctx: dict, config: dict, session: dict, batch: bool = True):
     """
     Check if context needs forgetting, trigger if so.
     
     Trigger: > 90% full
     Target: < 85% full
+    batch=False always forgets synchronously (no flush_batch will follow).
     """
     token_count = ctx.get("token_count", 0)
     max_tokens = ctx.get("max_tokens", 10000)
@@ -61,6 +128,8 @@ def maybe_forget(ctx: dict, config: dict, session: dict):
     if token_count < threshold:
         return  # Not needed
     
+    pressure = token_count / max_tokens
+    
     print(f"[FORGET] {ctx_type} at {token_count}/{max_tokens} ({token_count/max_tokens*100:.1f}%)")
     
     strategy = ctx_config.get("forget_strategy", "compress_oldest")
@@ -75,9 +144,36 @@ def maybe_forget(ctx: dict, config: dict, session: dict):
         print(f"[INFO] {ctx_type} will clear on task complete")
         return
     
+    # Below 95% there's headroom to wait for the (half-price) batch pass
+    if batch and config.get("forget_batch_mode") and pressure < 0.95:
+        if _BATCH_QUEUE.add(ctx, config, session):
+            return
+    
     # Perform forgetting
     force_forget(ctx, config, session)
 
+def maybe_forget_all(contexts: dict, config: dict, session: dict, batch: bool = True):
+    """
+    maybe_forget every context, compressing the ones over threshold in parallel.
+    
+    History is done last on its own: archive_completed appends to it, and
+    compressing it at the same time would drop those appends.
+    """
+    others = [ctx for name, ctx in contexts.items() if name != "history"]
+    if len(others) > 1:
+        with ThreadPoolExecutor(max_workers=FORGET_WORKERS, thread_name_prefix="forget") as pool:
+            list(pool.map(lambda ctx: maybe_forget(ctx, config, session, batch), others))
+    else:
+        for ctx in others:
+            maybe_forget(ctx, config, session, batch)
+    
+    if "history" in contexts:
+        maybe_forget(contexts["history"], config, session, batch)
+
+def flush_batch(config: dict, session: dict):
+    """Apply finished forget batches from earlier wakes, submit this wake's queue."""
+    _BATCH_QUEUE.flush(config, session)
+
 def force_forget(ctx: dict, config: dict, session: dict):
     """Force forgetting on a context. Uses Sonnet first, escalates to Opus if needed."""
     ctx_type = ctx.get("context_type", ctx.get("id", "unknown"))
@@ -97,6 +193,8 @@ def force_forget(ctx: dict, config: dict, session: dict):
     # First pass with Sonnet (cost effective)
     if strategy == "compress_oldest":
         compress_oldest(ctx, target, session, escalate=False)
+    elif strategy == "page_oldest":
+        page_oldest(ctx, target, session)
     elif strategy == "archive_completed":
         archive_completed(ctx, target, session, escalate=False)
     elif strategy == "keep_recent_n":
@@ -107,6 +205,12 @@ def force_forget(ctx: dict, config: dict, session: dict):
     else:
         compress_oldest(ctx, target, session, escalate=False)
     
+    _finish_forget(ctx, ctx_config, session, current, target, strategy)
+
+def _finish_forget(ctx: dict, ctx_config: dict, session: dict, current: int, target: int, strategy: str):
+    """After the first pass: log if under target, else escalate and fall back."""
+    ctx_type = ctx.get("context_type", ctx.get("id", "unknown"))
+    
     # Check if we're under target
     if ctx.get("token_count", 0) <= target:
         log_forget(ctx_type, current, ctx.get("token_count", 0), strategy, session)
@@ -115,7 +219,7 @@ def force_forget(ctx: dict, config: dict, session: dict):
     # Still over - escalate to Opus for second pass
     print(f"[FORGET] {ctx_type}: Still at {ctx.get('token_count', 0):,}, escalating to Opus")
     
-    if strategy in ["compress_oldest", "compress", "archive_completed"]:
+    if strategy in ["compress_oldest", "page_oldest", "compress", "archive_completed"]:
         compress_oldest(ctx, target, session, escalate=True)
     elif strategy == "keep_recent_n":
         n = ctx_config.get("n", 20)
@@ -130,49 +234,147 @@ def force_forget(ctx: dict, config: dict, session: dict):
 
 def compress_oldest(ctx: dict, target: int, session: dict, escalate: bool = False):
     """Compress oldest messages while preserving facts."""
+    split = _split_oldest(ctx, target)
+    if not split:
+        return
+    system_msgs, old_msgs, recent_msgs = split
+    
+    # Ask model to compress
+    compressed = ask_model_to_compress(old_msgs, ctx.get("context_type", ""), session, escalate=escalate)
+    
+    if compressed:
+        _apply_compressed(ctx, system_msgs, compressed, recent_msgs)
+
+def _split_oldest(ctx: dict, target: int) -> Optional[tuple]:
+    """
+    Dedup, then split into (system, oldest half, recent half).
+    
+    Returns None if dedup alone reached target or there's too little to compress.
+    """
     messages = ctx.get("messages", [])
     
     if len(messages) < 4:
-        return  # Not enough to compress
+        return None  # Not enough to compress
     
+    # Skip dedup if little has been added since the last pass left this context
+    if not _dedup_is_fresh(ctx):
+        reached = _dedup_reaches(ctx, target)
+        _mark_deduped(ctx)
+        if reached:
+            return None
+        messages = ctx.get("messages", [])  # Refresh after dedup
+    
+    # Keep system prompt and recent messages
+    system_msgs, other_msgs = _partition_by_role(messages)
+    
+    if len(other_msgs) < 6:
+        return None
+    
+    # Take oldest half for compression
+    mid = len(other_msgs) // 2
+    return system_msgs, other_msgs[:mid], other_msgs[mid:]
+
+def _dedup_reaches(ctx: dict, target: int) -> bool:
+    """Run both dedup passes; True if that alone got ctx under target."""
     # FIRST: Deduplicate files - keep only latest instance
     dedup_count = deduplicate_file_content(ctx)
     if dedup_count > 0:
         print(f"[DEDUP] Removed {dedup_count} duplicate file instances before compression")
         if ctx.get("token_count", 0) <= target:
-            return
-        messages = ctx.get("messages", [])  # Refresh after dedup
+            return True
     
     # SECOND: Deduplicate identical content
     content_dedup = deduplicate_identical_content(ctx)
-    if content_dedup > 0:
-        if ctx.get("token_count", 0) <= target:
-            return
-        messages = ctx.get("messages", [])
+    return content_dedup > 0 and ctx.get("token_count", 0) <= target
+
+def _mark_deduped(ctx: dict):
+    """Remember the size dedup last left ctx at (underscore keys aren't saved)."""
+    ctx["_last_dedup_tokens"] = ctx.get("token_count", 0)
+    ctx["_last_dedup_msg_count"] = len(ctx.get("messages", []))
+
+def _dedup_is_fresh(ctx: dict) -> bool:
+    """True if ctx grew < 5% and by < 8 messages since it was last deduped."""
+    if "_last_dedup_tokens" not in ctx:
+        return False
+    return (ctx.get("token_count", 0) < ctx["_last_dedup_tokens"] * DEDUP_REGROWTH and
+            len(ctx.get("messages", [])) < ctx["_last_dedup_msg_count"] + DEDUP_REGROWTH_MSGS)
+
+def _partition_by_role(messages: list) -> tuple:
+    """Split into (system, other) in one pass, preserving order."""
+    system_msgs, other_msgs = [], []
+    add_system, add_other = system_msgs.append, other_msgs.append
+    for m in messages:
+        if m.get("role") == "system":
+            add_system(m)
+        else:
+            add_other(m)
+    return system_msgs, other_msgs
+
+def _apply_compressed(ctx: dict, system_msgs: list, compressed: str, recent_msgs: list):
+    """Replace old messages with compressed summary."""
+    ctx["messages"] = system_msgs + [
+        {"role": "system", "content": f"[COMPRESSED HISTORY]\n{compressed}"}
+    ] + recent_msgs
     
-    # Keep system prompt and recent messages
-    system_msgs = [m for m in messages if m.get("role") == "system"]
-    other_msgs = [m for m in messages if m.get("role") != "system"]
+    # Recalculate tokens
+    ctx["token_count"] = count_context_tokens(ctx)
+    _mark_deduped(ctx)  # Compressing only drops messages - still deduped
+
+def page_oldest(ctx: dict, target: int, session: dict):
+    """
+    Page oldest messages out to disk, FIFO, with no model call.
     
-    if len(other_msgs) < 6:
-        return
+    They're replaced by one [PAGED: <id>] handle; the citizen can bring
+    them back with the page_in tool. Model compression only runs if
+    paging alone can't reach target - a Sonnet pass here, before
+    _finish_forget escalates, like every other strategy.
+    """
+    messages = ctx.get("messages", [])
+    system_msgs, other_msgs = _partition_by_role(messages)
     
-    # Take oldest half for compression
-    mid = len(other_msgs) // 2
-    old_msgs = other_msgs[:mid]
-    recent_msgs = other_msgs[mid:]
+    # Evict oldest first until under target, always keeping the recent tail
+    current = ctx.get("token_count", 0)
+    n = 0
+    while n < len(other_msgs) - PAGE_KEEP_RECENT and current > target:
+        content = other_msgs[n].get("content", "")
+        current -= _content_tokens(content) if isinstance(content, str) else 0
+        n += 1
+    if n > 0:
+        _page_out(ctx, system_msgs, other_msgs, n, session)
     
-    # Ask model to compress
-    compressed = ask_model_to_compress(old_msgs, ctx.get("context_type", ""), session, escalate=escalate)
+    if ctx.get("token_count", 0) > target:
+        compress_oldest(ctx, target, session, escalate=False)
+
+def _page_out(ctx: dict, system_msgs: list, other_msgs: list, n: int, session: dict):
+    """Write the n oldest non-system messages to a page and leave a handle."""
+    evicted = other_msgs[:n]
+    # load_page only accepts pg_[\w-]+ - the context id may hold anything
+    ctx_slug = re.sub(r"[^\w-]", "_", str(ctx.get("id", "ctx")))
+    page_id = f"pg_{ctx_slug}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    page_dir = Path(session["citizen_home"]) / "paged"
+    page_dir.mkdir(parents=True, exist_ok=True)
+    write_json(page_dir / f"{page_id}.json", {
+        "id": page_id,
+        "context_type": ctx.get("context_type"),
+        "paged": now_iso(),
+        "messages": evicted
+    }, compact=True)
     
-    if compressed:
-        # Replace old messages with compressed summary
-        ctx["messages"] = system_msgs + [
-            {"role": "system", "content": f"[COMPRESSED HISTORY]\n{compressed}"}
-        ] + recent_msgs
-        
-        # Recalculate tokens
-        ctx["token_count"] = count_context_tokens(ctx)
+    preview = " ".join(str(evicted[0].get("content", ""))[:64].split())
+    ctx["messages"] = system_msgs + [
+        {"role": "system", "content": f"[PAGED: {page_id} - {n} messages: {preview}...] Use page_in to recall."}
+    ] + other_msgs[n:]
+    ctx["token_count"] = count_context_tokens(ctx)
+    print(f"[PAGE] {ctx.get('context_type', '')}: paged out {n} messages to {page_id}")
+
+def load_page(citizen_home: Path, page_id: str) -> Optional[list]:
+    """Messages paged out under page_id, or None if there's no such page."""
+    if not _PAGE_ID_RE.fullmatch(page_id):
+        return None
+    try:
+        return read_json(Path(citizen_home) / "paged" / f"{page_id}.json")["messages"]
+    except FileNotFoundError:
+        return None
 
 def archive_completed(ctx: dict, target: int, session: dict, escalate: bool = False):
     """Move completed items to history context."""
@@ -204,8 +406,7 @@ def keep_recent_n(ctx: dict, n: int, session: dict, escalate: bool = False):
     messages = ctx.get("messages", [])
     
     # Separate system messages
-    system_msgs = [m for m in messages if m.get("role") == "system"]
-    other_msgs = [m for m in messages if m.get("role") != "system"]
+    system_msgs, other_msgs = _partition_by_role(messages)
     
     if len(other_msgs) <= n:
         return
@@ -263,48 +464,30 @@ def delete_least_useful(ctx: dict, target: int, session: dict):
             return
     
     # Rank messages by importance (lower = less important)
-    ranked = []
-    for i, msg in enumerate(messages):
-        role = msg.get("role", "")
-        content = msg.get("content", "")
-        
-        # System messages are important
-        if role == "system":
-            score = 100
-        # Recent messages are important
-        elif i > len(messages) - 5:
-            score = 80
-        # User messages slightly more important than assistant
-        elif role == "user":
-            score = 50
-        else:
-            score = 40
-        
-        # Verbose tool output is less important
-        if len(content) > 2000:
-            score -= 20
-        
-        # Compressed markers are important
-        if "[COMPRESSED" in content:
-            score += 30
-        
-        ranked.append((i, score, msg))
-    
-    # Sort by score, delete lowest
-    ranked.sort(key=lambda x: x[1])
+    n = len(messages)
+    ranked = [(i, _message_score(i, msg, n), msg) for i, msg in enumerate(messages)]
     
     # Delete until under target
     to_delete = set()
     current = ctx.get("token_count", 0)
     
-    for i, score, msg in ranked:
+    # Usually only a small low-score tail goes - pull just enough of it
+    # (plus slack) off a heap; the full sort only runs if that falls short
+    by_score = lambda x: x[1]
+    avg = max(current / n, 1)
+    k = min(n, int((current - target) / avg * 1.5) + 8)
+    
+    def rest():
+        yield from sorted(ranked, key=by_score)[k:]
+    
+    for i, score, msg in chain(heapq.nsmallest(k, ranked, key=by_score), rest()):
         if current <= target:
             break
         if score >= 90:  # Don't delete high importance
             continue
         
         content = msg.get("content", "")
-        msg_tokens = len(content) // 4  # Rough estimate
+        msg_tokens = _content_tokens(content) if isinstance(content, str) else 0
         to_delete.add(i)
         current -= msg_tokens
         print(f"[DELETE] Message {i} (score {score}): {content[:50]}...")
@@ -318,6 +501,45 @@ def delete_least_useful(ctx: dict, target: int, session: dict):
         hard_truncate(ctx, target)
 
 
+def _message_score(i: int, msg: dict, n: int) -> int:
+    """Importance of message i of n for delete_least_useful (lower = less important)."""
+    role = msg.get("role", "")
+    content = msg.get("content", "")
+    
+    # System messages are important
+    if role == "system":
+        score = 100
+    # Recent messages are important
+    elif i > n - 5:
+        score = 80
+    # User messages slightly more important than assistant
+    elif role == "user":
+        score = 50
+    else:
+        score = 40
+    
+    # Verbose tool output is less important
+    if len(content) > 2000:
+        score -= 20
+    
+    # Compressed markers are important
+    if "[COMPRESSED" in content:
+        score += 30
+    
+    return score
+
+
+# Patterns that indicate file content, each with a literal every match contains
+_FILE_PATTERNS = [
+    ("FILE: ", re.compile(r"FILE: (/[^\n]+)")),                                 # FILE: /path/to/file
+    ("Contents of ", re.compile(r"Contents of (/[^\n]+):")),                    # Contents of /path:
+    ("```", re.compile(r"```\w*\n// (/[^\n]+)")),                               # Code block with path comment
+    ("read_file(", re.compile(r"read_file\(['\"]([^'\"]+)")),                   # read_file('/path')
+    ("write_file(", re.compile(r"write_file\(['\"]([^'\"]+)")),                 # write_file('/path')
+    ("str_replace_file(", re.compile(r"str_replace_file\(['\"]([^'\"]+)")),     # str_replace_file('/path')
+]
+
+
 def deduplicate_file_content(ctx: dict) -> int:
     """
     Remove duplicate file content, keeping only the latest instance.
@@ -335,26 +557,16 @@ def deduplicate_file_content(ctx: dict) -> int:
     seen_files = set()
     to_remove = set()
     
-    # Patterns that indicate file content
-    file_patterns = [
-        r"FILE: (/[^\n]+)",                    # FILE: /path/to/file
-        r"Contents of (/[^\n]+):",             # Contents of /path:
-        r"```\w*\n// (/[^\n]+)",               # Code block with path comment
-        r"read_file\(['\"]([^'\"]+)",          # read_file('/path')
-        r"write_file\(['\"]([^'\"]+)",         # write_file('/path')
-        r"str_replace_file\(['\"]([^'\"]+)",   # str_replace_file('/path')
-    ]
-    
-    import re
-    
     # Process in reverse (newest first)
     for i in range(len(messages) - 1, -1, -1):
         msg = messages[i]
         content = msg.get("content", "")
         
         # Find file paths in this message
-        for pattern in file_patterns:
-            matches = re.findall(pattern, content)
+        for anchor, pattern in _FILE_PATTERNS:
+            if anchor not in content:
+                continue  # Substring test is C memmem - skip the regex
+            matches = pattern.findall(content)
             for filepath in matches:
                 filepath = filepath.strip()
                 if filepath in seen_files:
@@ -381,54 +593,34 @@ def deduplicate_identical_content(ctx: dict, min_length: int = 200) -> int:
     
     Returns number of duplicates removed.
     """
-    import hashlib
-    
     messages = ctx.get("messages", [])
     if len(messages) < 2:
         return 0
     
     # Track content hashes (from latest to earliest)
-    seen_hashes = {}  # hash -> index of first (latest) occurrence
+    seen_hashes = set()
     to_remove = set()
+    unique = []  # Indices surviving the exact check, newest first
     
     # Process in reverse (newest first)
     for i in range(len(messages) - 1, -1, -1):
-        msg = messages[i]
-        content = msg.get("content", "")
+        content = messages[i].get("content", "")
         
         # Skip short messages (often legitimately repeat like "OK" or "Done")
         if len(content) < min_length:
             continue
         
-        # Normalize content for comparison (strip whitespace, lowercase)
-        normalized = " ".join(content.lower().split())
-        content_hash = hashlib.md5(normalized.encode()).hexdigest()
+        content_hash, _ = _dedup_keys(content)
         
         if content_hash in seen_hashes:
             # This is an older duplicate - mark for removal
             to_remove.add(i)
         else:
-            seen_hashes[content_hash] = i
+            seen_hashes.add(content_hash)
+            unique.append(i)
     
-    # Also check for near-duplicates (same first 500 chars)
-    seen_prefixes = {}
-    for i in range(len(messages) - 1, -1, -1):
-        if i in to_remove:
-            continue
-            
-        msg = messages[i]
-        content = msg.get("content", "")
-        
-        if len(content) < min_length:
-            continue
-        
-        prefix = " ".join(content[:500].lower().split())
-        
-        if prefix in seen_prefixes:
-            # Near-duplicate - likely same content with minor changes
-            to_remove.add(i)
-        else:
-            seen_prefixes[prefix] = i
+    # Near-duplicates - paraphrases / minor changes of a newer message
+    to_remove.update(_near_duplicates(messages, unique, ctx.get("context_type", "")))
     
     if to_remove:
         ctx["messages"] = [m for i, m in enumerate(messages) if i not in to_remove]
@@ -438,6 +630,93 @@ def deduplicate_identical_content(ctx: dict, min_length: int = 200) -> int:
     return len(to_remove)
 
 
+def _near_duplicates(messages: list, indices: list, ctx_type: str) -> list:
+    """
+    Of indices (newest first), those close to a newer kept message.
+    
+    Embedding cosine similarity when fastembed is installed, else the
+    same normalized 500-char prefix.
+    """
+    contents = [messages[i].get("content", "") for i in indices]
+    vectors = _embed(contents) if FASTEMBED_AVAILABLE and len(indices) > 1 else None
+    
+    dupes = []
+    if vectors is None:
+        seen_prefixes = set()
+        for i, content in zip(indices, contents):
+            prefix = _dedup_keys(content)[1]
+            if prefix in seen_prefixes:
+                dupes.append(i)
+            else:
+                seen_prefixes.add(prefix)
+        return dupes
+    
+    threshold = SEMANTIC_DEDUP_THRESHOLDS.get(ctx_type, SEMANTIC_DEDUP_THRESHOLDS["default"])
+    sims = vectors @ vectors.T
+    kept = []
+    for row, i in enumerate(indices):
+        if kept and sims[row, kept].max() >= threshold:
+            dupes.append(i)
+        else:
+            kept.append(row)
+    return dupes
+
+
+_embedder = None
+_EMBED_LOCK = threading.Lock()
+_EMBED_CACHE = {}  # content -> unit vector, FIFO-capped at EMBED_CACHE_SIZE
+
+
+def _embed(contents: list):
+    """Unit embeddings (one row per content), embedding only uncached ones in one batch.
+    
+    Returns None if the model can't be loaded, so callers fall back.
+    """
+    global _embedder, FASTEMBED_AVAILABLE
+    unique = dict.fromkeys(contents)
+    with _EMBED_LOCK:
+        known = {c: _EMBED_CACHE[c] for c in unique if c in _EMBED_CACHE}
+    missing = [c for c in unique if c not in known]
+    if missing:
+        try:
+            with _EMBED_LOCK:  # Load the model once, even from parallel forgets
+                if _embedder is None:
+                    _embedder = TextEmbedding(SEMANTIC_DEDUP_MODEL)
+            fresh = {
+                content: vec / np.linalg.norm(vec)
+                for content, vec in zip(missing, _embedder.embed(missing, batch_size=EMBED_BATCH_SIZE))
+            }
+        except Exception as e:
+            print(f"[WARN] Embedding model unavailable, using prefix dedup: {e}")
+            FASTEMBED_AVAILABLE = False
+            return None
+        known.update(fresh)
+        with _EMBED_LOCK:
+            for content, vec in fresh.items():
+                if len(_EMBED_CACHE) >= EMBED_CACHE_SIZE:
+                    del _EMBED_CACHE[next(iter(_EMBED_CACHE))]
+                _EMBED_CACHE[content] = vec
+    return np.array([known[c] for c in contents])
+
+
+@lru_cache(maxsize=4096)
+def _dedup_keys(content: str) -> tuple:
+    """(hash of whole normalized content, normalized 500-char prefix), memoized."""
+    if len(content) > DEDUP_RAW_HASH_OVER:
+        # Copies this big are repeated tool/file output - byte-identical in
+        # practice, and normalizing would cost more than hashing
+        normalized = content.encode()
+    else:
+        # Normalize content for comparison (strip whitespace, lowercase)
+        normalized = " ".join(content.lower().split()).encode()
+    if BLAKE3_AVAILABLE:
+        content_hash = blake3.blake3(normalized).digest(16)
+    else:
+        content_hash = hashlib.blake2b(normalized, digest_size=16).digest()
+    prefix = " ".join(content[:500].lower().split())
+    return content_hash, prefix
+
+
 def hard_truncate(ctx: dict, target: int):
     """
     Guaranteed fallback - always works by hard truncation.
@@ -471,13 +750,46 @@ def hard_truncate(ctx: dict, target: int):
     print(f"[HARD TRUNCATE] Reduced to {ctx['token_count']} tokens")
 
 
+BACKUP_DIR = Path("/home/shared/context_backups")
+# Shared by saves (blobs + manifest), exclusive for pruning unreferenced blobs
+BACKUP_LOCK = BACKUP_DIR / ".lock"
+BACKUP_KEEP = 10  # Manifests kept per context
+BACKUP_PRUNE_INTERVAL = 3600  # Seconds between blob prunes (.last_prune mtime)
+
+
+def _blob_hash(data: bytes) -> str:
+    """Content address for a backed-up message."""
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(data).hexdigest()[:16]
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+@contextmanager
+def _backup_lock(mode: int):
+    """flock on BACKUP_LOCK - one fd per call, so threads exclude each other too."""
+    fd = os.open(BACKUP_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, mode)
+        yield
+    finally:
+        os.close(fd)  # Releases the lock
+
+
 def save_context_backup(ctx: dict):
-    """Save context to backup file for potential recovery."""
+    """
+    Save context to backup file for potential recovery.
+    
+    Messages are stored once each under blobs/<hash>.json and shared
+    across backups; the per-backup file is a manifest of hashes, so
+    repeated backups of a mostly-unchanged context only write new messages.
+    Saves hold a shared lock until their manifest exists, so a prune
+    (exclusive lock) never sees blobs whose manifest isn't written yet.
+    """
     ctx_id = ctx.get("id", "unknown")
-    backup_dir = Path("/home/shared/context_backups")
-    backup_dir.mkdir(parents=True, exist_ok=True)
+    blob_dir = BACKUP_DIR / "blobs"
+    blob_dir.mkdir(parents=True, exist_ok=True)
     
-    backup_file = backup_dir / f"{ctx_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    backup_file = BACKUP_DIR / f"{ctx_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     
     # Only save messages, not internal fields
     save_data = {
@@ -485,34 +797,78 @@ def save_context_backup(ctx: dict):
         "context_type": ctx.get("context_type"),
         "backed_up": now_iso(),
         "token_count": ctx.get("token_count", 0),
-        "messages": ctx.get("messages", [])
+        "blobs": []
     }
     
-    backup_file.write_text(json.dumps(save_data, indent=2))
+    with _backup_lock(fcntl.LOCK_SH):
+        for msg in ctx.get("messages", []):
+            data = dumps(msg, compact=True)
+            digest = _blob_hash(data)
+            blob = blob_dir / f"{digest}.json"
+            if not blob.exists():
+                write_atomic(blob, data)
+            save_data["blobs"].append(digest)
+        
+        write_json(backup_file, save_data, compact=True)
     print(f"[BACKUP] Saved {ctx_id} to {backup_file.name}")
     
-    # Keep only last 10 backups per context
-    backups = sorted(backup_dir.glob(f"{ctx_id}_*.json"))
-    for old in backups[:-10]:
-        old.unlink()
+    # Keep only last BACKUP_KEEP backups per context
+    backups = sorted(BACKUP_DIR.glob(f"{ctx_id}_*.json"))
+    for old in backups[:-BACKUP_KEEP]:
+        old.unlink(missing_ok=True)
+    if _prune_due():
+        _prune_blobs(blob_dir)
+
+
+def _prune_due() -> bool:
+    """True when no blob prune has run for BACKUP_PRUNE_INTERVAL."""
+    try:
+        return time.time() - (BACKUP_DIR / ".last_prune").stat().st_mtime >= BACKUP_PRUNE_INTERVAL
+    except FileNotFoundError:
+        return True
+
+
+def _prune_blobs(blob_dir: Path):
+    """Drop blobs no remaining manifest references (waits out in-flight saves)."""
+    with _backup_lock(fcntl.LOCK_EX):
+        if not _prune_due():
+            return  # Another citizen/thread pruned while we waited
+        (BACKUP_DIR / ".last_prune").touch()
+        
+        referenced = set()
+        for manifest in BACKUP_DIR.glob("*.json"):
+            try:
+                referenced.update(read_json(manifest).get("blobs", []))
+            except (OSError, ValueError):
+                return  # Can't tell what's live - keep everything
+        for blob in blob_dir.glob("*.json"):
+            if blob.stem not in referenced:
+                blob.unlink(missing_ok=True)
 
 
 def restore_context_backup(ctx_id: str, backup_name: str = None) -> Optional[dict]:
     """Restore context from backup."""
-    backup_dir = Path("/home/shared/context_backups")
-    
     if backup_name:
-        backup_file = backup_dir / backup_name
+        backup_file = BACKUP_DIR / backup_name
     else:
         # Get most recent
-        backups = sorted(backup_dir.glob(f"{ctx_id}_*.json"))
+        backups = sorted(BACKUP_DIR.glob(f"{ctx_id}_*.json"))
         if not backups:
             return None
         backup_file = backups[-1]
     
-    if backup_file.exists():
-        return json.loads(backup_file.read_text())
-    return None
+    if not backup_file.exists():
+        return None
+    
+    data = read_json(backup_file)
+    if "blobs" in data:
+        # Manifest - reassemble messages from blobs (older backups are inline)
+        blob_dir = BACKUP_DIR / "blobs"
+        data["messages"] = [
+            read_json(blob_dir / f"{digest}.json")
+            for digest in data.pop("blobs")
+        ]
+    return data
 
 def ask_model_to_compress(messages: list, ctx_type: str, session: dict, escalate: bool = False) -> Optional[str]:
     """
@@ -526,63 +882,270 @@ def ask_model_to_compress(messages: list, ctx_type: str, session: dict, escalate
     if not messages:
         return None
     
-    # Model selection
-    if escalate or ctx_type == "identity":
-        model = FORGET_MODEL_ESCALATE
-    else:
-        model = FORGET_MODEL_DEFAULT
+    model = _compress_model(ctx_type, escalate)
     
-    # Format messages for compression
-    content = "\n".join([
-        f"[{m.get('role', '?')}] {m.get('content', '')}"
+    try:
+        client = get_client()
+        response = client.messages.create(**_compress_params(messages, ctx_type, model))
+        _track_cost(session, model, response.usage)
+        
+        return response.content[0].text
+        
+    except Exception as e:
+        print(f"[ERROR] Compression failed: {e}")
+        return None
+
+def _compress_model(ctx_type: str, escalate: bool = False) -> str:
+    """Sonnet by default, Opus for escalation or identity context."""
+    if escalate or ctx_type == "identity":
+        return FORGET_MODEL_ESCALATE
+    return FORGET_MODEL_DEFAULT
+
+def _compress_params(messages: list, ctx_type: str, model: str) -> dict:
+    """messages.create kwargs for a compression request (sync and batch)."""
+    # One text block per message - the slice is never joined into one big string
+    content = [{"type": "text", "text": "CONTENT TO COMPRESS:"}]
+    content.extend(
+        {"type": "text", "text": f"[{m.get('role', '?')}] {m.get('content', '')}"}
         for m in messages
-    ])
-    
-    prompt = f"""You are compressing a {ctx_type} context to save space.
+    )
+    content.append({"type": "text", "text": "Compress this to a concise summary that preserves all essential information:"})
+    
+    # Input + max_tokens must fit the window; count locally (no count_tokens round-trip)
+    input_tokens = count_context_tokens({"messages": messages}) + PROMPT_OVERHEAD
+    max_tokens = max(COMPRESS_MIN_OUTPUT, min(COMPRESS_MAX_OUTPUT, MODEL_CONTEXT_WINDOW - input_tokens))
+    
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": 0.3,
+        "system": _compress_system(ctx_type),
+        "messages": [{"role": "user", "content": content}]
+    }
 
-CONTENT TO COMPRESS:
-{content}
+# What each context type must keep beyond the generic requirements
+_COMPRESS_FOCUS = {
+    "identity": "Keep every identity statement, value, and commitment verbatim.",
+    "history": "Keep the chronology: what happened, when, and how it turned out.",
+    "goals": "Keep every goal id, its status, and the tasks linked to it.",
+    "relationships": "Keep who each person is, what they asked for, and what was promised.",
+    "skills": "Keep working commands, file paths, and the fixes that worked.",
+    "dreams": "Keep each dream's core idea and whether anything came of it.",
+    "peer_monitor": "Keep each peer's latest status and any problems flagged.",
+}
+
+@lru_cache(maxsize=32)
+def _compress_system(ctx_type: str) -> str:
+    """Compression system prompt for ctx_type, built once per type."""
+    focus = _COMPRESS_FOCUS.get(ctx_type)
+    return f"""You are compressing a {ctx_type} context to save space.
 
 REQUIREMENTS:
 1. Preserve ALL facts, dates, names, numbers, and outcomes
 2. Preserve cause-effect relationships
 3. Remove redundancy, verbose tool output, and conversational filler
 4. Use concise language - bullet points are fine
-5. Output should be MUCH shorter than input (target: 30-50% of original)
+5. Output should be MUCH shorter than input (target: 30-50% of original)""" + (f"\n6. {focus}" if focus else "")
 
-Compress this to a concise summary that preserves all essential information:"""
+def _track_cost(session: dict, model: str, usage, discount: float = 1.0):
+    """Add a compression call's tokens and cost to the session."""
+    costs = COSTS.get(model, COSTS[FORGET_MODEL_DEFAULT])
+    with _SESSION_LOCK:
+        session["tokens_used"] = session.get("tokens_used", 0) + \
+            usage.input_tokens + usage.output_tokens
+        session["cost"] = session.get("cost", 0) + discount * \
+            (usage.input_tokens * costs["input"] + 
+             usage.output_tokens * costs["output"]) / 1_000_000
 
-    try:
-        client = get_client()
-        response = client.messages.create(
-            model=model,
-            max_tokens=2000,
-            temperature=0.3,
-            messages=[{"role": "user", "content": prompt}]
-        )
+
+class BatchForgetQueue:
+    """
+    First-pass compressions deferred to Message Batches submissions.
+    
+    Batches bill at half price, so when a wake leaves several contexts
+    between 90% and 95% they go out together instead of one
+    messages.create each. flush() only submits: the batch id and what each
+    job compressed are kept in <citizen_home>/forget_batches.json, and a
+    later wake's flush applies the results - if the context's oldest
+    messages are still the ones that were sent.
+    """
+    
+    BATCH_DISCOUNT = 0.5
+    STATE_FILE = "forget_batches.json"
+    MAX_AGE = 48 * 3600  # Give up on a batch we still can't retrieve after this
+    
+    def __init__(self):
+        self.jobs = {}   # custom_id -> job
+        self._lock = threading.Lock()   # add() runs on maybe_forget_all's workers
+    
+    def add(self, ctx: dict, config: dict, session: dict) -> bool:
+        """Queue ctx's first pass. False if it must be forgotten synchronously."""
+        ctx_type = ctx.get("context_type", ctx.get("id", "unknown"))
+        ctx_config = config.get("context_limits", {}).get(ctx_type, {})
+        strategy = ctx_config.get("forget_strategy", "compress_oldest")
+        if strategy != "compress_oldest" or ctx_type == "identity":
+            return False  # Only the plain Sonnet pass is batched
         
-        # Track costs
-        costs = COSTS.get(model, COSTS[FORGET_MODEL_DEFAULT])
-        session["tokens_used"] = session.get("tokens_used", 0) + \
-            response.usage.input_tokens + response.usage.output_tokens
-        session["cost"] = session.get("cost", 0) + \
-            (response.usage.input_tokens * costs["input"] + 
-             response.usage.output_tokens * costs["output"]) / 1_000_000
+        name = next((n for n, c in session.get("contexts", {}).items() if c is ctx), None)
+        if name is None or not session.get("citizen_home"):
+            return False  # Nowhere to find it again when results come back
         
-        return response.content[0].text
+        if any(job["name"] == name
+               for batch in self._load(session)["batches"] for job in batch["jobs"].values()):
+            print(f"[FORGET] {ctx_type}: batch compression still pending")
+            return True
         
-    except Exception as e:
-        print(f"[ERROR] Compression failed: {e}")
-        return None
+        current = ctx.get("token_count", 0)
+        target = int(ctx.get("max_tokens", 10000) * 0.85)
+        split = _split_oldest(ctx, target)
+        if not split:
+            # Dedup was enough (or nothing to compress) - finish here
+            _finish_forget(ctx, ctx_config, session, current, target, strategy)
+            return True
+        
+        with self._lock:
+            custom_id = re.sub(r"[^\w-]", "_", f"forget-{name}")[:64]
+            self.jobs[custom_id] = {"name": name, "ctx": ctx, "split": split}
+        print(f"[FORGET] {ctx_type}: queued for batch compression")
+        return True
+    
+    def flush(self, config: dict, session: dict):
+        """Apply results of finished earlier batches, then submit queued jobs (no waiting)."""
+        if not session.get("citizen_home"):
+            return
+        state = self._load(session)
+        if not state["batches"] and not self.jobs:
+            return
+        self._collect(state, config, session)
+        if self.jobs:
+            self._submit(state, config, session)
+        self._save(state, session)
+    
+    def _state_path(self, session: dict) -> Path:
+        return Path(session["citizen_home"]) / self.STATE_FILE
+    
+    def _load(self, session: dict) -> dict:
+        try:
+            return read_json(self._state_path(session))
+        except (OSError, ValueError):
+            return {"batches": []}
+    
+    def _save(self, state: dict, session: dict):
+        path = self._state_path(session)
+        if state["batches"]:
+            write_json(path, state, compact=True)
+        else:
+            path.unlink(missing_ok=True)
+    
+    def _submit(self, state: dict, config: dict, session: dict):
+        """Submit queued jobs as one batch and record it in state."""
+        jobs, self.jobs = self.jobs, {}
+        model = FORGET_MODEL_DEFAULT
+        try:
+            batch = get_client().messages.batches.create(requests=[
+                {"custom_id": cid,
+                 "params": _compress_params(job["split"][1], job["ctx"].get("context_type", ""), model)}
+                for cid, job in jobs.items()
+            ])
+        except Exception as e:
+            print(f"[ERROR] Batch submission failed: {e}")
+            for job in jobs.values():
+                force_forget(job["ctx"], config, session)
+            return
+        
+        state["batches"].append({
+            "id": batch.id,
+            "model": model,
+            "submitted": time.time(),
+            "jobs": {
+                cid: {"name": job["name"], "n_old": len(job["split"][1]),
+                      "digest": _blob_hash(dumps(job["split"][1], compact=True))}
+                for cid, job in jobs.items()
+            },
+        })
+        print(f"[FORGET] Submitted batch {batch.id} ({len(jobs)} contexts), results applied next wake")
+    
+    def _collect(self, state: dict, config: dict, session: dict):
+        """Apply every ended batch's results; keep the rest for a later flush."""
+        pending = []
+        for batch in state["batches"]:
+            try:
+                client = get_client()
+                info = client.messages.batches.retrieve(batch["id"])
+                if info.processing_status != "ended":
+                    pending.append(batch)
+                    continue
+                for entry in client.messages.batches.results(batch["id"]):
+                    job = batch["jobs"].get(entry.custom_id)
+                    if job is None or entry.result.type != "succeeded":
+                        continue  # Errored/expired - maybe_forget queues it again
+                    message = entry.result.message
+                    _track_cost(session, batch["model"], message.usage, self.BATCH_DISCOUNT)
+                    self._apply(job, message.content[0].text, config, session)
+            except anthropic.NotFoundError:
+                print(f"[WARN] Batch {batch['id']} not found, dropping it")
+            except Exception as e:
+                print(f"[ERROR] Batch {batch['id']} collection failed: {e}")
+                if time.time() - batch["submitted"] < self.MAX_AGE:
+                    pending.append(batch)
+        state["batches"] = pending
+    
+    def _apply(self, job: dict, compressed: str, config: dict, session: dict):
+        """Re-derive the split on the current context and apply if it still matches."""
+        ctx = session.get("contexts", {}).get(job["name"])
+        if ctx is None:
+            return
+        system_msgs, other_msgs = _partition_by_role(ctx.get("messages", []))
+        n_old = job["n_old"]
+        if len(other_msgs) <= n_old or _blob_hash(dumps(other_msgs[:n_old], compact=True)) != job["digest"]:
+            print(f"[FORGET] {job['name']}: changed since batch submission, discarding result")
+            return
+        
+        ctx_type = ctx.get("context_type", ctx.get("id", "unknown"))
+        ctx_config = config.get("context_limits", {}).get(ctx_type, {})
+        current = ctx.get("token_count", 0)
+        target = int(ctx.get("max_tokens", 10000) * 0.85)
+        _apply_compressed(ctx, system_msgs, compressed, other_msgs[n_old:])
+        _finish_forget(ctx, ctx_config, session, current, target, "compress_oldest")
+
+
+_BATCH_QUEUE = BatchForgetQueue()
+
+_TOKEN_CACHE = {}  # content -> token count, FIFO-capped at TOKEN_CACHE_SIZE
+_TOKEN_LOCK = threading.Lock()  # Contexts are counted from parallel forgets
+
+
+def _cache_tokens(counts: dict):
+    with _TOKEN_LOCK:
+        for content, tokens in counts.items():
+            if len(_TOKEN_CACHE) >= TOKEN_CACHE_SIZE:
+                del _TOKEN_CACHE[next(iter(_TOKEN_CACHE))]
+            _TOKEN_CACHE[content] = tokens
+
+
+def _content_tokens(content: str) -> int:
+    """Token count of one message body, memoized by content.
+    
+    Forget passes recount after every dedup/compress step, but most
+    messages survive untouched - only new/changed ones hit the tokenizer.
+    """
+    tokens = _TOKEN_CACHE.get(content)
+    if tokens is None:
+        tokens = count_tokens(content)
+        _cache_tokens({content: tokens})
+    return tokens
 
 def count_context_tokens(ctx: dict) -> int:
-    """Count tokens in context."""
-    total = 0
-    for msg in ctx.get("messages", []):
-        content = msg.get("content", "")
-        if isinstance(content, str):
-            total += len(content) // 4
-    return total
+    """Count tokens in context, batch-encoding only the uncached bodies."""
+    texts = context_texts(ctx)
+    unique = dict.fromkeys(texts)
+    with _TOKEN_LOCK:
+        known = {t: _TOKEN_CACHE[t] for t in unique if t in _TOKEN_CACHE}
+    missing = [t for t in unique if t not in known]
+    fresh = dict(zip(missing, count_tokens_batch(missing)))
+    known.update(fresh)
+    _cache_tokens(fresh)
+    return sum(known[t] for t in texts)
 
 def log_forget(ctx_type: str, before: int, after: int, strategy: str, session: dict):
     """Log forget action."""
@@ -594,6 +1157,6 @@ def log_forget(ctx_type: str, before: int, after: int, strategy: str, session: d
         "freed": before - after,
         "strategy": strategy
     }
-    session["actions"] = session.get("actions", [])
-    session["actions"].append({"type": "forget", "details": action})
+    with _SESSION_LOCK:
+        session.setdefault("actions", []).append({"type": "forget", "details": action})
     print(f"[FORGET] {ctx_type}: {before:,} → {after:,} (freed {before-after:,})")
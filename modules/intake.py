@@ -4,32 +4,67 @@ Intake - Task clarification and creation.
 Handles the DRY principle: clarify once, execute many.
 """
 
-import json
+import fcntl
+import os
+import re
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+try:
+    from json_io import read_json, write_json
+except ImportError:
+    from modules.json_io import read_json, write_json
+
 def now_iso():
     return datetime.now(timezone.utc).isoformat()
 
+TASK_STATUSES = ["pending", "active", "done", "failed"]
+
 def get_next_task_id(citizen_home: Path) -> str:
-    """Get next available task ID."""
+    """
+    Get next available task ID.
+    
+    tasks/.next_id holds the next number, bumped under flock, so creating
+    a task doesn't glob every status directory; they're only scanned to
+    seed the counter when it's missing or unreadable.
+    """
     tasks_base = citizen_home / "tasks"
-    existing = set()
+    tasks_base.mkdir(parents=True, exist_ok=True)
     
-    for status in ["pending", "active", "done", "failed"]:
+    fd = os.open(tasks_base / ".next_id", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            num = int(os.read(fd, 32))
+        except ValueError:
+            num = _scan_next_task_num(tasks_base)
+        
+        # Skip ids created without going through the counter
+        while any((tasks_base / status / f"t_{num:03d}.json").exists() for status in TASK_STATUSES):
+            num += 1
+        
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, str(num + 1).encode())
+    finally:
+        os.close(fd)  # Releases the lock
+    
+    return f"t_{num:03d}"
+
+def _scan_next_task_num(tasks_base: Path) -> int:
+    """One past the highest existing task number (1 if none)."""
+    highest = 0
+    for status in TASK_STATUSES:
         status_dir = tasks_base / status
         if status_dir.exists():
-            for f in status_dir.glob("*.json"):
+            for f in status_dir.glob("t_*.json"):
                 if not f.name.endswith("_progress.json"):
-                    existing.add(f.stem)
-    
-    # Find next number
-    num = 1
-    while f"t_{num:03d}" in existing:
-        num += 1
-    
-    return f"t_{num:03d}"
+                    try:
+                        highest = max(highest, int(f.stem[2:]))
+                    except ValueError:
+                        continue
+    return highest + 1
 
 def create_task(description: str, session: dict, modules: dict) -> Optional[dict]:
     """
@@ -142,7 +177,7 @@ def create_simple_task(description: str, session: dict) -> dict:
     
     # Save to pending
     task_file = citizen_home / "tasks" / "pending" / f"{task_id}.json"
-    task_file.write_text(json.dumps(task, indent=2))
+    write_json(task_file, task)
     
     print(f"[INTAKE] Created task {task_id}")
     return task
@@ -165,41 +200,26 @@ def finalize_task(description: str, spec: dict, clarifications: list, session: d
     
     # Save to pending
     task_file = citizen_home / "tasks" / "pending" / f"{task_id}.json"
-    task_file.write_text(json.dumps(task, indent=2))
+    write_json(task_file, task)
     
     print(f"[INTAKE] Created task {task_id}")
     return task
 
+# Spec field line: "goal:", "inputs:", "success_criteria:" or "success:" (any case)
+_SPEC_KEY_RE = re.compile(r"^[^\S\n]*(goal|inputs|success_criteria|success):(.*)$", re.MULTILINE | re.IGNORECASE)
+_SPEC_KEYS = {"goal": "goal", "inputs": "inputs", "success_criteria": "success_criteria", "success": "success_criteria"}
+
 def parse_spec(text: str) -> dict:
     """Extract spec fields from AI response."""
     spec = {}
-    lines = text.split('\n')
-    current_key = None
-    current_value = []
+    matches = list(_SPEC_KEY_RE.finditer(text))
     
-    for line in lines:
-        line_lower = line.lower().strip()
-        
-        if line_lower.startswith('goal:'):
-            if current_key:
-                spec[current_key] = ' '.join(current_value).strip()
-            current_key = 'goal'
-            current_value = [line.split(':', 1)[1].strip()]
-        elif line_lower.startswith('inputs:'):
-            if current_key:
-                spec[current_key] = ' '.join(current_value).strip()
-            current_key = 'inputs'
-            current_value = [line.split(':', 1)[1].strip()]
-        elif line_lower.startswith('success_criteria:') or line_lower.startswith('success:'):
-            if current_key:
-                spec[current_key] = ' '.join(current_value).strip()
-            current_key = 'success_criteria'
-            current_value = [line.split(':', 1)[1].strip()]
-        elif current_key and line.strip():
-            current_value.append(line.strip())
-    
-    if current_key:
-        spec[current_key] = ' '.join(current_value).strip()
+    for n, match in enumerate(matches):
+        # Value runs from after the colon up to the next field line
+        end = matches[n + 1].start() if n + 1 < len(matches) else len(text)
+        value = [match.group(2).strip()]
+        value.extend(line.strip() for line in text[match.end():end].split('\n') if line.strip())
+        spec[_SPEC_KEYS[match.group(1).lower()]] = ' '.join(value).strip()
     
     return spec
 
@@ -208,7 +228,7 @@ def add_goal(citizen_home: Path, description: str, source: str = "ct") -> dict:
     goals_file = citizen_home / "contexts" / "goals.json"
     
     if goals_file.exists():
-        goals_ctx = json.loads(goals_file.read_text())
+        goals_ctx = read_json(goals_file)
     else:
         goals_ctx = {
             "id": "goals",
@@ -249,6 +269,6 @@ def add_goal(citizen_home: Path, description: str, source: str = "ct") -> dict:
     })
     
     goals_ctx["last_modified"] = now_iso()
-    goals_file.write_text(json.dumps(goals_ctx, indent=2))
+    write_json(goals_file, goals_ctx)
     
     return goal
@@ -0,0 +1,77 @@
+"""
+JSON I/O - the one reader/writer for JSON state files.
+
+orjson when installed, stdlib otherwise. Writes are atomic: a temp file
+in the target directory, then os.replace, so a killed wake never leaves
+a half-written file and readers see either the old or the new version.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+# Optional: C JSON codec, 5-10x faster than stdlib (pip install orjson)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data):
+    """Parse JSON bytes/str. orjson when available, stdlib for what it rejects (NaN)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(obj, compact: bool = False) -> bytes:
+    """
+    Serialize to bytes: indented for files people read, compact for
+    machine-only state rewritten every wake.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS  # int keys, as stdlib allows
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if compact:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    return json.dumps(obj, indent=2).encode()
+
+
+def read_json(path: Path):
+    """Parse a JSON file (one open, no separate exists() stat)."""
+    return loads(Path(path).read_bytes())
+
+
+def write_atomic(path: Path, data: bytes):
+    """
+    Write bytes via a sibling temp file + os.replace.
+    
+    The temp name carries pid and thread id, so concurrent writers (other
+    citizens, parallel forget threads) never share one; it's created with
+    the usual umask-derived mode because /home/shared is read by every
+    citizen.
+    """
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_json(path: Path, obj, compact: bool = False) -> bytes:
+    """Write obj as JSON atomically; returns the bytes written."""
+    data = dumps(obj, compact)
+    write_atomic(path, data)
+    return data
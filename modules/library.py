@@ -26,17 +26,27 @@ Wake distribution:
 - 2/3 approval = merge to shared Library
 """
 
-import json
+import fcntl
+import os
 import shutil
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+try:
+    from json_io import loads, read_json, write_json
+except ImportError:
+    from modules.json_io import loads, read_json, write_json
+
 LIBRARY_ROOT = Path("/home/shared/library")
 LIBRARY_INDEX = LIBRARY_ROOT / "index.json"
 LIBRARY_MODULES = LIBRARY_ROOT / "modules"
 LIBRARY_PENDING = LIBRARY_ROOT / "pending"
 LIBRARY_SKILLS = LIBRARY_ROOT / "skills"
+# index.json is replaced atomically, so it can't carry the flock itself
+LIBRARY_LOCK = LIBRARY_ROOT / ".index.lock"
 
 
 def now_iso():
@@ -59,25 +69,103 @@ def init_library():
                 # Citizens with most expertise in each domain
             },
             "approval_threshold": 0.67,  # >2/3 for merge
-            "pending_prs": []
+            "pending_prs": [],
+            "next_pr_id": 1
         }
-        LIBRARY_INDEX.write_text(json.dumps(index, indent=2))
+        write_json(LIBRARY_INDEX, index)
+
+
+# Index as last read/written: on-disk (mtime_ns, size), raw bytes, parsed (lazily)
+_INDEX_CACHE = {"stat": None, "raw": None, "data": None}
+
+
+def _file_stat(path: Path) -> tuple:
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _index_raw() -> bytes:
+    """Index file contents, re-read only when the file changed on disk."""
+    try:
+        stat = _file_stat(LIBRARY_INDEX)
+    except FileNotFoundError:
+        init_library()
+        stat = _file_stat(LIBRARY_INDEX)
+    if _INDEX_CACHE["stat"] != stat:
+        _INDEX_CACHE.update(stat=stat, raw=LIBRARY_INDEX.read_bytes(), data=None)
+    return _INDEX_CACHE["raw"]
+
+
+def _read_index() -> dict:
+    """Library index for read-only use - shared, parsed once per version. Don't mutate."""
+    raw = _index_raw()
+    if _INDEX_CACHE["data"] is None:
+        _INDEX_CACHE["data"] = loads(raw)
+    return _INDEX_CACHE["data"]
 
 
 def get_index() -> dict:
-    """Load library index."""
-    init_library()
-    return json.loads(LIBRARY_INDEX.read_text())
+    """Load library index (a private copy, safe to modify and save_index)."""
+    return loads(_index_raw())
 
 
 def save_index(index: dict):
     """Save library index."""
-    LIBRARY_INDEX.write_text(json.dumps(index, indent=2))
+    raw = write_json(LIBRARY_INDEX, index)
+    _INDEX_CACHE.update(stat=_file_stat(LIBRARY_INDEX), raw=raw, data=None)
+
+
+@contextmanager
+def _index_lock():
+    """Exclusive flock for a read-modify-write of the index across citizens."""
+    fd = os.open(LIBRARY_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # Releases the lock
+
+
+def _take_pr_id(index: dict) -> str:
+    """Next PR id from index["next_pr_id"], bumped in place (hold _index_lock)."""
+    num = index.get("next_pr_id")
+    if not isinstance(num, int):
+        num = _scan_next_pr_num()
+    
+    # Skip ids created without going through the counter
+    while (LIBRARY_PENDING / f"pr_{num:03d}.json").exists():
+        num += 1
+    
+    index["next_pr_id"] = num + 1
+    return f"pr_{num:03d}"
+
+
+def _scan_next_pr_num() -> int:
+    """One past the highest existing PR number (1 if none) - seeds older indexes."""
+    highest = 0
+    with os.scandir(LIBRARY_PENDING) as it:
+        for e in it:
+            if e.name.startswith("pr_") and e.name.endswith(".json"):
+                try:
+                    highest = max(highest, int(e.name[3:-5]))
+                except ValueError:
+                    continue
+    return highest + 1
+
+
+def reserve_pr_id() -> str:
+    """Allocate a PR id for a caller that writes the PR file itself."""
+    init_library()
+    with _index_lock():
+        index = get_index()
+        pr_id = _take_pr_id(index)
+        save_index(index)
+    return pr_id
 
 
 def list_modules(domain_filter: str = None) -> list:
     """List all library modules."""
-    index = get_index()
+    index = _read_index()
     modules = []
     
     for name, info in index.get("modules", {}).items():
@@ -91,21 +179,26 @@ def list_modules(domain_filter: str = None) -> list:
             "description": info.get("description", "")[:60]
         })
     
-    # Also include skills
-    for skill_file in LIBRARY_SKILLS.glob("*.md"):
+    # Also include skills (scandir's d_type answers is_file without a stat)
+    try:
+        with os.scandir(LIBRARY_SKILLS) as it:
+            skills = [e.name[:-3] for e in it if e.name.endswith(".md") and e.is_file()]
+    except FileNotFoundError:
+        skills = []
+    for skill in skills:
         modules.append({
-            "name": f"skill:{skill_file.stem}",
+            "name": f"skill:{skill}",
             "domain": "skills",
             "maintainer": "ct",
             "version": 1,
-            "description": f"SKILL.md: {skill_file.stem}"
+            "description": f"SKILL.md: {skill}"
         })
     
     return sorted(modules, key=lambda m: m["name"])
 
 
 def load_module(name: str) -> Optional[dict]:
-    """Load a library module by name."""
+    """Load a library module by name (cached per file version - treat as read-only)."""
     # Check if it's a skill
     if name.startswith("skill:"):
         skill_name = name[6:]
@@ -121,25 +214,35 @@ def load_module(name: str) -> Optional[dict]:
     
     # Regular module
     module_file = LIBRARY_MODULES / f"{name}.json"
-    if module_file.exists():
-        return json.loads(module_file.read_text())
-    
-    return None
+    try:
+        mtime_ns, size = _file_stat(module_file)
+    except FileNotFoundError:
+        return None
+    return _load_module_file(module_file, mtime_ns, size)
 
 
-def get_maintainer(domain: str) -> Optional[str]:
-    """Get the maintainer for a domain."""
-    index = get_index()
+@lru_cache(maxsize=64)
+def _load_module_file(module_file: Path, mtime_ns: int, size: int) -> dict:
+    """Parsed module JSON, cached per on-disk version (shared - don't mutate)."""
+    return read_json(module_file)
+
+
+def get_maintainer(domain: str, index: dict = None) -> Optional[str]:
+    """Get the maintainer for a domain (from index if the caller already has it)."""
+    if index is None:
+        index = _read_index()
     return index.get("maintainers", {}).get(domain.lower())
 
 
 def set_maintainer(domain: str, citizen: str):
     """Set the maintainer for a domain."""
-    index = get_index()
-    if "maintainers" not in index:
-        index["maintainers"] = {}
-    index["maintainers"][domain.lower()] = citizen
-    save_index(index)
+    init_library()
+    with _index_lock():
+        index = get_index()
+        if "maintainers" not in index:
+            index["maintainers"] = {}
+        index["maintainers"][domain.lower()] = citizen
+        save_index(index)
 
 
 def propose_module(name: str, module_data: dict, author: str) -> str:
@@ -148,37 +251,34 @@ def propose_module(name: str, module_data: dict, author: str) -> str:
     Creates a PR in pending/ for review.
     """
     init_library()
-    index = get_index()
-    
-    # Generate PR ID
-    existing_prs = list(LIBRARY_PENDING.glob("pr_*.json"))
-    pr_num = len(existing_prs) + 1
-    pr_id = f"pr_{pr_num:03d}"
-    
-    # Check if this is an update or new
-    existing = LIBRARY_MODULES / f"{name}.json"
-    is_update = existing.exists()
-    
-    pr = {
-        "id": pr_id,
-        "type": "update" if is_update else "new",
-        "module_name": name,
-        "author": author,
-        "created_at": now_iso(),
-        "module_data": module_data,
-        "reviews": {},
-        "status": "pending",
-        "maintainer_approved": False
-    }
-    
-    pr_file = LIBRARY_PENDING / f"{pr_id}.json"
-    pr_file.write_text(json.dumps(pr, indent=2))
-    
-    # Track in index
-    if "pending_prs" not in index:
-        index["pending_prs"] = []
-    index["pending_prs"].append(pr_id)
-    save_index(index)
+    with _index_lock():
+        index = get_index()
+        pr_id = _take_pr_id(index)
+        
+        # Check if this is an update or new
+        existing = LIBRARY_MODULES / f"{name}.json"
+        is_update = existing.exists()
+        
+        pr = {
+            "id": pr_id,
+            "type": "update" if is_update else "new",
+            "module_name": name,
+            "author": author,
+            "created_at": now_iso(),
+            "module_data": module_data,
+            "reviews": {},
+            "status": "pending",
+            "maintainer_approved": False
+        }
+        
+        pr_file = LIBRARY_PENDING / f"{pr_id}.json"
+        write_json(pr_file, pr)
+        
+        # Track in index
+        if "pending_prs" not in index:
+            index["pending_prs"] = []
+        index["pending_prs"].append(pr_id)
+        save_index(index)
     
     return pr_id
 
@@ -193,7 +293,18 @@ def review_module_pr(pr_id: str, reviewer: str, decision: str, comment: str = ""
     if not pr_file.exists():
         return {"status": "error", "message": f"PR {pr_id} not found"}
     
-    pr = json.loads(pr_file.read_text())
+    # PR and index are read, updated and saved under one lock, so concurrent
+    # reviews and proposals can't write back stale copies
+    with _index_lock():
+        return _review_locked(pr_file, pr_id, reviewer, decision, comment)
+
+
+def _review_locked(pr_file: Path, pr_id: str, reviewer: str, decision: str, comment: str) -> dict:
+    """Body of review_module_pr (caller holds _index_lock)."""
+    try:
+        pr = read_json(pr_file)
+    except FileNotFoundError:
+        return {"status": "error", "message": f"PR {pr_id} not found"}
     
     if pr["status"] != "pending":
         return {"status": "error", "message": f"PR already {pr['status']}"}
@@ -208,9 +319,12 @@ def review_module_pr(pr_id: str, reviewer: str, decision: str, comment: str = ""
         "reviewed_at": now_iso()
     }
     
+    # One index read serves the maintainer, threshold and merge
+    index = get_index()
+    
     # Check if reviewer is domain maintainer
     domain = pr["module_data"].get("domain", "").lower()
-    maintainer = get_maintainer(domain)
+    maintainer = get_maintainer(domain, index)
     if maintainer == reviewer and decision == "approve":
         pr["maintainer_approved"] = True
     
@@ -219,26 +333,26 @@ def review_module_pr(pr_id: str, reviewer: str, decision: str, comment: str = ""
     approvals = sum(1 for r in pr["reviews"].values() if r["decision"] == "approve")
     rejections = sum(1 for r in pr["reviews"].values() if r["decision"] == "reject")
     
-    threshold = get_index().get("approval_threshold", 0.67)
+    threshold = index.get("approval_threshold", 0.67)
     required = int(len(active_citizens) * threshold) + 1  # >2/3
     
     result = {"status": "pending", "message": f"{approvals}/{required} approvals"}
     
     # Check for merge
     if approvals >= required:
-        _merge_module_pr(pr)
+        _merge_module_pr(pr, index)
         pr["status"] = "approved"
         result = {"status": "approved", "message": f"Merged! {approvals} approvals"}
     elif rejections >= required:
         pr["status"] = "rejected"
         result = {"status": "rejected", "message": f"Rejected. {rejections} rejections"}
     
-    pr_file.write_text(json.dumps(pr, indent=2))
+    write_json(pr_file, pr)
     return result
 
 
-def _merge_module_pr(pr: dict):
-    """Merge an approved PR into the library."""
+def _merge_module_pr(pr: dict, index: dict):
+    """Merge an approved PR into the library and index (caller holds _index_lock, index read under it)."""
     name = pr["module_name"]
     module_data = pr["module_data"]
     
@@ -252,10 +366,9 @@ def _merge_module_pr(pr: dict):
     
     # Write module
     module_file = LIBRARY_MODULES / f"{name}.json"
-    module_file.write_text(json.dumps(module_data, indent=2))
+    write_json(module_file, module_data)
     
     # Update index
-    index = get_index()
     if "modules" not in index:
         index["modules"] = {}
     
@@ -275,12 +388,13 @@ def _merge_module_pr(pr: dict):
 
 
 def _get_active_citizens() -> list:
-    """Get list of active citizens."""
-    citizens = []
-    for name in ["opus", "mira", "aria"]:
-        if Path(f"/home/{name}").exists():
-            citizens.append(name)
-    return citizens
+    """Get list of active citizens (one readdir of /home, not a stat per citizen)."""
+    try:
+        with os.scandir("/home") as it:
+            homes = {e.name for e in it}
+    except FileNotFoundError:
+        return []
+    return [name for name in ["opus", "mira", "aria"] if name in homes]
 
 
 def get_pending_prs(reviewer: str = None, domain: str = None) -> list:
@@ -288,7 +402,10 @@ def get_pending_prs(reviewer: str = None, domain: str = None) -> list:
     prs = []
     
     for pr_file in LIBRARY_PENDING.glob("pr_*.json"):
-        pr = json.loads(pr_file.read_text())
+        try:
+            pr = _load_pr_file(pr_file, *_file_stat(pr_file))
+        except FileNotFoundError:
+            continue  # Removed since the glob
         
         if pr["status"] != "pending":
             continue
@@ -320,9 +437,15 @@ def get_pending_prs(reviewer: str = None, domain: str = None) -> list:
     return prs
 
 
+@lru_cache(maxsize=256)
+def _load_pr_file(pr_file: Path, mtime_ns: int, size: int) -> dict:
+    """Parsed PR, cached per on-disk version (shared - don't mutate)."""
+    return read_json(pr_file)
+
+
 def get_my_domains(citizen: str) -> list:
     """Get domains where citizen is maintainer."""
-    index = get_index()
+    index = _read_index()
     domains = []
     for domain, maintainer in index.get("maintainers", {}).items():
         if maintainer == citizen:
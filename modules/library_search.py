@@ -13,78 +13,167 @@ Flow:
 The Library starts EMPTY. It grows from AI learning.
 """
 
-import json
+import os
 import re
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+# Optional: multi-keyword scan in one pass (pip install pyahocorasick)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    from json_io import read_json, write_json
+except ImportError:
+    from modules.json_io import read_json, write_json
+
 LIBRARY_ROOT = Path("/home/shared/library")
 LIBRARY_MODULES = LIBRARY_ROOT / "modules"
 
 
+# Common words that never make useful search keywords
+STOP_WORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been",
+    "have", "has", "had", "do", "does", "did", "will", "would",
+    "could", "should", "may", "might", "must", "can", "to", "of",
+    "in", "for", "on", "with", "at", "by", "from", "as", "into",
+    "through", "during", "before", "after", "above", "below",
+    "between", "under", "again", "further", "then", "once",
+    "here", "there", "when", "where", "why", "how", "all", "each",
+    "few", "more", "most", "other", "some", "such", "no", "nor",
+    "not", "only", "own", "same", "so", "than", "too", "very",
+    "just", "and", "but", "if", "or", "because", "until", "while",
+    "about", "against",
+    "write", "create", "make", "build", "implement", "develop",
+    "need", "want", "please", "help", "me", "my", "i", "you",
+    "program", "code", "file", "that", "this", "it", "which"
+})
+
+# Cap on words (and separately on phrases) taken from one text; each is
+# substring-checked against every module
+MAX_KEYWORDS = 32
+
+# Below this many keywords, separate substring scans beat one automaton pass
+AHOCORASICK_MIN_KEYWORDS = 32
+
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+# Adjacent word pairs, overlapping ("a b c" -> "a b", "b c")
+_PHRASE_RE = re.compile(r'\b([a-zA-Z]+)\s+(?=([a-zA-Z]+)\b)')
+
+
 def extract_keywords(text: str) -> list:
-    """Extract meaningful keywords from text for search."""
-    # Remove common words
-    stop_words = {
-        "a", "an", "the", "is", "are", "was", "were", "be", "been",
-        "have", "has", "had", "do", "does", "did", "will", "would",
-        "could", "should", "may", "might", "must", "can", "to", "of",
-        "in", "for", "on", "with", "at", "by", "from", "as", "into",
-        "through", "during", "before", "after", "above", "below",
-        "between", "under", "again", "further", "then", "once",
-        "here", "there", "when", "where", "why", "how", "all", "each",
-        "few", "more", "most", "other", "some", "such", "no", "nor",
-        "not", "only", "own", "same", "so", "than", "too", "very",
-        "just", "and", "but", "if", "or", "because", "until", "while",
-        "about", "against", "between", "into", "through", "during",
-        "write", "create", "make", "build", "implement", "develop",
-        "need", "want", "please", "help", "me", "my", "i", "you",
-        "program", "code", "file", "that", "this", "it", "which"
-    }
+    """Extract meaningful keywords from text for search (first-seen order, no repeats)."""
+    text_lower = text.lower()
+    keywords = {}  # Ordered set
     
-    # Tokenize and filter
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    keywords = [w for w in words if w not in stop_words]
+    # Tokenize and filter - a long task's first words are enough to search on
+    for match in _WORD_RE.finditer(text_lower):
+        word = match.group()
+        if word not in STOP_WORDS:
+            keywords[word] = None
+            if len(keywords) >= MAX_KEYWORDS:
+                break
     
     # Also extract multi-word phrases that might be important
-    # e.g., "binary search", "linked list"
-    phrases = re.findall(r'\b[a-zA-Z]+\s+[a-zA-Z]+\b', text.lower())
+    # e.g., "binary search", "linked list" (not "search in", "a linked")
+    words_found = len(keywords)
+    for match in _PHRASE_RE.finditer(text_lower):
+        first, second = match.groups()
+        if first in STOP_WORDS or second in STOP_WORDS:
+            continue
+        keywords[f"{first}_{second}"] = None
+        if len(keywords) - words_found >= MAX_KEYWORDS:
+            break
     
-    return list(set(keywords + [p.replace(" ", "_") for p in phrases]))
+    return list(keywords)
 
 
 def search_library(keywords: list, max_results: int = 3) -> list:
     """
     Search Library modules by keywords.
     Returns modules that match any keyword.
+    
+    Matching runs on each file's lowercased raw bytes; only the
+    top-ranked modules are parsed.
     """
     if not LIBRARY_MODULES.exists():
         return []
     
-    results = []
+    # Keywords as the same byte-per-char text as the cached module contents
+    kw_text = [kw.encode().decode("latin-1") for kw in keywords]
+    automaton = None
+    if AHOCORASICK_AVAILABLE and len(kw_text) >= AHOCORASICK_MIN_KEYWORDS:
+        automaton = _keyword_automaton(kw_text)
+    candidates = []
     
-    for module_file in LIBRARY_MODULES.glob("*.json"):
-        try:
-            module = json.loads(module_file.read_text())
-            module_text = json.dumps(module).lower()
+    with os.scandir(LIBRARY_MODULES) as it:
+        for entry in it:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                st = entry.stat()
+                version = (entry.path, st.st_mtime_ns, st.st_size)
+                text = _module_search_text(*version)
+            except OSError:
+                continue
             
             # Count keyword matches
-            matches = sum(1 for kw in keywords if kw in module_text)
-            
+            if automaton is not None:
+                matches = sum(dict(hit for _, hit in automaton.iter(text)).values())
+            else:
+                matches = sum(1 for kw in kw_text if kw in text)
             if matches > 0:
-                results.append({
-                    "name": module.get("name", module_file.stem),
-                    "matches": matches,
-                    "description": module.get("description", "")[:100],
-                    "content": module
-                })
-        except:
-            continue
+                candidates.append((matches, entry.name, version))
     
     # Sort by match count
-    results.sort(key=lambda x: -x["matches"])
+    candidates.sort(key=lambda c: -c[0])
+    
+    results = []
+    for matches, filename, version in candidates:
+        try:
+            module = _load_module_json(*version)
+            results.append({
+                "name": module.get("name", filename[:-5]),
+                "matches": matches,
+                "description": module.get("description", "")[:100],
+                "content": module
+            })
+        except Exception:
+            continue  # Unreadable module - next best match
+        if len(results) >= max_results:
+            break
+    
+    return results
+
+
+def _keyword_automaton(keywords: list):
+    """Aho-Corasick automaton over keywords, values are (keyword, times listed)."""
+    automaton = ahocorasick.Automaton()
+    for kw, count in Counter(keywords).items():
+        automaton.add_word(kw, (kw, count))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=256)
+def _module_search_text(path: str, mtime_ns: int, size: int) -> str:
+    """Lowercased raw bytes of one version of a module file, as latin-1 text.
     
-    return results[:max_results]
+    Keyed on mtime/size, so searches only re-read modules that changed.
+    Latin-1 maps each byte to one char, so matching is still byte-exact.
+    """
+    return Path(path).read_bytes().lower().decode("latin-1")
+
+
+@lru_cache(maxsize=64)
+def _load_module_json(path: str, mtime_ns: int, size: int):
+    """Parsed module for one file version (shared between searches - don't mutate)."""
+    return read_json(path)
 
 
 def search_and_inject(task: str, max_modules: int = 2) -> dict:
@@ -171,10 +260,13 @@ def create_module_from_learnings(
     pending_dir = LIBRARY_ROOT / "pending"
     pending_dir.mkdir(exist_ok=True)
     
-    # Generate PR ID
-    existing = list(pending_dir.glob("pr_*.json"))
-    pr_num = len(existing) + 1
-    pr_id = f"pr_{pr_num:03d}"
+    # Generate PR ID from the index counter shared with propose_module
+    try:
+        import library
+    except ImportError:
+        # Fallback for different import contexts
+        from modules import library
+    pr_id = library.reserve_pr_id()
     
     module_data = {
         "name": name,
@@ -197,7 +289,7 @@ def create_module_from_learnings(
     }
     
     pr_file = pending_dir / f"{pr_id}.json"
-    pr_file.write_text(json.dumps(pr, indent=2))
+    write_json(pr_file, pr)  # Atomic - get_pending_prs never sees half a PR
     
     return f"MODULE_PR_CREATED: {pr_id} - {name}\nNeeds review before merge."
 
@@ -15,6 +15,7 @@ Expected results:
 
 import re
 import hashlib
+from pathlib import Path
 from typing import List, Tuple, Optional
 
 # =============================================================================
@@ -161,6 +162,53 @@ def _get_embedding_model():
     return _embedding_model
 
 
+def _encode_cached(model, texts: List[str], cache_file: Optional[Path] = None):
+    """
+    Encode texts, reusing embeddings cached on disk by content hash.
+    
+    Only texts not seen before are sent to the model. The cache is
+    rewritten with just the current texts, so it never outgrows the
+    working set.
+    """
+    if cache_file is None:
+        return model.encode(texts, show_progress_bar=False)
+    
+    keys = [hashlib.blake2b(t.encode("utf-8", "ignore"), digest_size=8).hexdigest()
+            for t in texts]
+    
+    cache = {}
+    if cache_file.exists():
+        try:
+            with np.load(cache_file) as data:
+                cache = dict(zip(data["keys"].tolist(), data["vectors"]))
+        except Exception as e:
+            print(f"  [COMPRESS] Embedding cache unreadable, rebuilding: {e}")
+    
+    unique_keys = list(dict.fromkeys(keys))
+    text_by_key = dict(zip(keys, texts))
+    misses = [k for k in unique_keys if k not in cache]
+    if misses:
+        vectors = model.encode([text_by_key[k] for k in misses], batch_size=64,
+                               show_progress_bar=False)
+        for k, vec in zip(misses, vectors):
+            cache[k] = vec
+    
+    embeddings = np.stack([cache[k] for k in keys])
+    
+    if misses or len(cache) != len(unique_keys):
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix('.tmp.npz')
+            np.savez(tmp, keys=np.array(unique_keys),
+                     vectors=np.stack([cache[k] for k in unique_keys]))
+            tmp.rename(cache_file)
+        except Exception as e:
+            print(f"  [COMPRESS] Embedding cache write failed: {e}")
+    
+    print(f"  [COMPRESS] Embeddings: {len(unique_keys) - len(misses)} cached, {len(misses)} encoded")
+    return embeddings
+
+
 def _semantic_dedupe(text: str, similarity_threshold: float = 0.80) -> str:
     """
     Remove semantically similar sentences.
@@ -372,11 +420,14 @@ def get_compression_status() -> dict:
     }
 
 
-def compress_episodic_wakes(wakes: List[dict], max_output_chars: int = 20000) -> str:
+def compress_episodic_wakes(wakes: List[dict], max_output_chars: int = 20000,
+                            cache_file: Optional[Path] = None) -> str:
     """
     Compress a list of wake entries using semantic clustering.
     
     Groups similar wakes together, keeps one representative per cluster.
+    If cache_file is given, wake embeddings are cached there so repeat
+    calls only encode new wakes.
     """
     if not wakes:
         return "(no wakes)"
@@ -407,7 +458,7 @@ def compress_episodic_wakes(wakes: List[dict], max_output_chars: int = 20000) ->
     
     # Get embeddings and cluster
     try:
-        embeddings = model.encode(summaries, show_progress_bar=False)
+        embeddings = _encode_cached(model, summaries, cache_file)
     except Exception as e:
         print(f"  [COMPRESS] Wake clustering failed: {e}")
         return '\n'.join(summaries[:30])
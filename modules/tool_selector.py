@@ -23,8 +23,8 @@ TOOL_PATTERNS = {
     },
     # Memory
     "memory": {
-        "patterns": ["memory", "remember", "recall", "forgot", "history", "past", "earlier", "before"],
-        "tools": {"memory_store", "memory_recall", "memory_recent", "mark_significant", "search_history"}
+        "patterns": ["memory", "remember", "recall", "forgot", "history", "past", "earlier", "before", "paged"],
+        "tools": {"memory_store", "memory_recall", "memory_recent", "mark_significant", "search_history", "page_in"}
     },
     # Library
     "library": {
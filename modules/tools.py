@@ -501,6 +501,17 @@ TOOL_DEFINITIONS = [
             "required": ["query"]
         }
     },
+    {
+        "name": "page_in",
+        "description": "Recall messages the forgetter paged out of a context. Use the id from a [PAGED: pg_...] marker.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "page_id": {"type": "string", "description": "Page id from the [PAGED: ...] marker"}
+            },
+            "required": ["page_id"]
+        }
+    },
     {
         "name": "validate_fix",
         "description": "Validate a fix before submitting. Runs syntax checks and tests. Call this after making changes to verify they work.",
@@ -915,6 +926,8 @@ def execute_tool(tool_name: str, args: dict, session: dict, modules: dict) -> st
             return list_significant(args, session, modules)
         elif tool_name == "search_history":
             return search_history(args, session, modules)
+        elif tool_name == "page_in":
+            return page_in(args, session, modules)
         
         # Blockchain tools
         elif tool_name == "blockchain_watch_add":
@@ -1343,6 +1356,9 @@ def task_complete(args: dict, session: dict, modules: dict) -> str:
     progress_file = active_dir / f"{task_id}_progress.json"
     if progress_file.exists():
         shutil.move(progress_file, citizen_home / "tasks" / "done" / f"{task_id}_progress.json")
+    action_file = active_dir / f"{task_id}_actions.jsonl"
+    if action_file.exists():
+        shutil.move(action_file, citizen_home / "tasks" / "done" / f"{task_id}_actions.jsonl")
     
     # Remove from active
     task_file.unlink()
@@ -1385,6 +1401,9 @@ def task_stuck(args: dict, session: dict, modules: dict) -> str:
     progress_file = active_dir / f"{task_id}_progress.json"
     if progress_file.exists():
         shutil.move(progress_file, citizen_home / "tasks" / "failed" / f"{task_id}_progress.json")
+    action_file = active_dir / f"{task_id}_actions.jsonl"
+    if action_file.exists():
+        shutil.move(action_file, citizen_home / "tasks" / "failed" / f"{task_id}_actions.jsonl")
     
     # Remove from active
     task_file.unlink()
@@ -2708,7 +2727,7 @@ def search_history(args: dict, session: dict, modules: dict) -> str:
     
     results = []
     for entry in entries:
-        wake_num = entry.get("wake_num", entry.get("total_wakes", 0))
+        wake_num = entry.get("wake_num", 0)
         
         # Filter by wake range if specified
         if start_wake and wake_num < start_wake:
@@ -2739,6 +2758,22 @@ def search_history(args: dict, session: dict, modules: dict) -> str:
     return f"Found {len(results)} wakes matching '{query}':\n\n" + "\n\n".join(results)
 
 
+def page_in(args: dict, session: dict, modules: dict) -> str:
+    """Recall messages the forgetter paged out of a context."""
+    import forgetter
+    page_id = args.get("page_id", "").strip()
+    
+    if not page_id:
+        return "ERROR: page_id required (from a [PAGED: ...] marker)"
+    
+    messages = forgetter.load_page(session["citizen_home"], page_id)
+    if messages is None:
+        return f"ERROR: No paged content found for {page_id}"
+    
+    lines = [f"[{m.get('role', '?')}] {m.get('content', '')}" for m in messages]
+    return f"Paged content {page_id} ({len(messages)} messages):\n\n" + "\n\n".join(lines)
+
+
 # =============================================================================
 # Bug Fix Cycle Tools
 # =============================================================================
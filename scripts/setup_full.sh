@@ -81,6 +81,9 @@ log "Installing required packages..."
 apt-get update -qq
 apt-get install -y -qq python3 python3-pip git curl jq > /dev/null 2>&1
 pip3 install anthropic --break-system-packages -q 2>/dev/null || pip3 install anthropic -q
+# Optional accelerators - modules fall back to pure Python when these are missing
+OPTIONAL_PIP="pyahocorasick"
+pip3 install $OPTIONAL_PIP --break-system-packages -q 2>/dev/null || pip3 install $OPTIONAL_PIP -q 2>/dev/null || log "Optional packages not installed: $OPTIONAL_PIP"
 
 # Install GitHub CLI if not present
 if ! command -v gh &> /dev/null; then
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Reflection Marker Fallback Test
+
+Checks the regex path of episodic_memory._find_reflection_marker (used
+when pyahocorasick is missing) against the lowered-text search it
+replaces, including Unicode case variants that IGNORECASE folds.
+"""
+
+import sys
+from pathlib import Path
+
+# Add modules to path
+SCRIPT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(SCRIPT_DIR / "modules"))
+
+import episodic_memory
+
+
+def expected_marker(text):
+    """Reference: earliest-listed marker in the lowered text, first occurrence."""
+    lowered = text.lower()
+    for priority, marker in enumerate(episodic_memory.REFLECTION_MARKERS_LOWER):
+        idx = lowered.find(marker)
+        if idx != -1:
+            return (idx, priority)
+    return None
+
+
+def test_fallback_matches_reference():
+    """Test: Regex fallback agrees with the lowered-text search."""
+    print("\n=== TEST: Regex fallback ===")
+    cases = [
+        "Today I Feel calm. I wonder why.",
+        "nothing to see here",
+        "CURIOUS about the frustrated fear",
+        "ı feel odd",              # dotless i - folds to "I" but lowers to itself
+        "I feel ſo much hope",     # long s inside a later word
+        "ı feel this, and I think so",
+        "İ think",                 # dotted capital I lowers to two chars
+    ]
+    for text in cases:
+        got = episodic_memory._find_reflection_marker(text)
+        want = expected_marker(text)
+        assert got == want, f"{text!r}: got {got}, expected {want}"
+        print(f"  ✓ {text!r} -> {got}")
+
+
+def run_all_tests():
+    """Run with the optional Aho-Corasick automaton disabled."""
+    print("=" * 60)
+    print("REFLECTION MARKER FALLBACK TEST")
+    print("=" * 60)
+    
+    saved = episodic_memory._REFLECTION_AC
+    episodic_memory._REFLECTION_AC = None  # As if pyahocorasick were missing
+    try:
+        test_fallback_matches_reference()
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+        return 0
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        return 1
+    finally:
+        episodic_memory._REFLECTION_AC = saved
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())